@@ -0,0 +1,260 @@
+"""Benchmarks for the decay, vector and histogram hot paths.
+
+Run from the repository root:
+
+    python benchmarks/hotpaths.py --output results.json
+    python benchmarks/hotpaths.py --baseline results.json --threshold 0.15
+
+Every case is timed at several event counts (best of --repeat runs) and
+reports events/sec, ns/op and peak traced memory. With --baseline the run
+is compared against a stored result file and the exit status is 1 if any
+case got slower than the threshold allows.
+"""
+from __future__ import division, print_function
+from timeit import default_timer as _timer
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+import numpy as np
+from decaysim.particle import Mother
+from decaysim.batchdecay import particleBatch, decayBatch, decayBatchN
+from decaysim.distributions import RandomStream
+from decaysim.histogram import Hist1D
+from decaysim import utils
+
+
+def _Mothers(n, rng):
+    return particleBatch(91.188, rng.exponential(50., n),
+                         rng.normal(0., 100., n), n, rng)
+
+
+def _Scalars(vecs):
+    return [vecs.Vector(i) for i in range(len(vecs))]
+
+
+#Each case maps a name to (setup(n, rng) -> state, run(state), isScalar).
+def _SetupDecay(n, rng):
+    return [Mother(91.188, pt, rng=rng) for pt in rng.exponential(50., n)]
+
+
+def _RunDecay(mothers):
+    for m in mothers:
+        m.Decay(0.105, 0.105)
+
+
+def _SetupDecayBatch(n, rng):
+    return _Mothers(n, rng), rng
+
+
+def _RunDecayBatch(state):
+    mothers, rng = state
+    decayBatch(mothers, 0.105, 0.105, rng, 91.188)
+
+
+def _RunDecayN(mothers):
+    for m in mothers:
+        m.DecayN((0.105, 0.105, 0.))
+
+
+def _RunDecayBatchN(state):
+    mothers, rng = state
+    decayBatchN(mothers, (0.105, 0.105, 0.), rng, 91.188)
+
+
+def _SetupBoost(n, rng):
+    m = _Mothers(n, rng)
+    d = _Mothers(n, rng)
+    return _Scalars(d), [v.BoostVector() for v in _Scalars(m)]
+
+
+def _RunBoost(state):
+    vecs, betas = state
+    for v, b in zip(vecs, betas):
+        v.Boost(b)
+
+
+def _SetupBoostBatch(n, rng):
+    return _Mothers(n, rng), _Mothers(n, rng).BoostVector()
+
+
+def _RunBoostBatch(state):
+    vecs, betas = state
+    vecs.Boost(betas)
+
+
+def _SetupPair(n, rng):
+    return _Scalars(_Mothers(n, rng)), _Scalars(_Mothers(n, rng))
+
+
+def _SetupPairBatch(n, rng):
+    return _Mothers(n, rng), _Mothers(n, rng)
+
+
+def _RunEta(state):
+    for v in state[0]:
+        v.Eta()
+
+
+def _RunEtaBatch(state):
+    state[0].Eta()
+
+
+def _RunDeltaR(state):
+    for a, b in zip(*state):
+        a.DeltaR(b)
+
+
+def _RunDeltaRBatch(state):
+    state[0].DeltaR(state[1])
+
+
+def _SetupCosTheta(n, rng):
+    a, b = _SetupPair(n, rng)
+    return [list(v.Generator()) for v in a], [list(v.Generator()) for v in b]
+
+
+def _RunCosTheta(state):
+    for a, b in zip(*state):
+        utils.CosTheta(a, b)
+
+
+def _RunCosThetaBatch(state):
+    state[0].CosTheta(state[1])
+
+
+def _RunCosThetaArray(state):
+    utils.CosThetaArray(state[0], state[1])
+
+
+def _SetupFill(n, rng):
+    return Hist1D('h', 100, 0., 200.), rng.exponential(50., n)
+
+
+def _RunFill(state):
+    hist, values = state
+    for v in values:
+        hist.Fill(v)
+
+
+def _RunFillBatch(state):
+    hist, values = state
+    hist.Fill(values)
+
+
+CASES = [
+    ('Mother.Decay', _SetupDecay, _RunDecay, True),
+    ('decayBatch', _SetupDecayBatch, _RunDecayBatch, False),
+    ('Mother.DecayN 3-body', _SetupDecay, _RunDecayN, True),
+    ('decayBatchN 3-body', _SetupDecayBatch, _RunDecayBatchN, False),
+    ('VecFour.Boost', _SetupBoost, _RunBoost, True),
+    ('VecFourArray.Boost', _SetupBoostBatch, _RunBoostBatch, False),
+    ('VecThree.Eta', _SetupPair, _RunEta, True),
+    ('VecThreeArray.Eta', _SetupPairBatch, _RunEtaBatch, False),
+    ('VecThree.DeltaR', _SetupPair, _RunDeltaR, True),
+    ('VecThreeArray.DeltaR', _SetupPairBatch, _RunDeltaRBatch, False),
+    ('utils.CosTheta', _SetupCosTheta, _RunCosTheta, True),
+    ('VecThreeArray.CosTheta', _SetupPairBatch, _RunCosThetaBatch, False),
+    ('utils.CosThetaArray', _SetupPairBatch, _RunCosThetaArray, False),
+    ('Hist1D.Fill per event', _SetupFill, _RunFill, True),
+    ('Hist1D.Fill batch', _SetupFill, _RunFillBatch, False),
+]
+
+
+def runCase(setup, run, n, repeat, seed):
+    """Return the best time and the peak traced memory of run(setup())."""
+    best = float('inf')
+    for i in range(repeat):
+        state = setup(n, RandomStream(seed))
+        start = _timer()
+        run(state)
+        best = min(best, _timer() - start)
+    state = setup(n, RandomStream(seed))
+    tracemalloc.start()
+    run(state)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+def runAll(sizes, maxScalar, repeat, seed, select=None):
+    results = []
+    for name, setup, run, isScalar in CASES:
+        if( select and not any(s in name for s in select) ):
+            continue
+        for n in sizes:
+            if( isScalar and n > maxScalar ):
+                continue
+            seconds, peak = runCase(setup, run, n, repeat, seed)
+            result = {'name': name, 'n': n, 'seconds': seconds,
+                      'eventsPerSec': n / seconds if seconds > 0 else 0.,
+                      'nsPerOp': 1e9 * seconds / n, 'peakBytes': peak}
+            print('%-24s %9d %14.0f ev/s %10.1f ns/op %10.1f kB' % (
+                name, n, result['eventsPerSec'], result['nsPerOp'],
+                peak / 1024.))
+            results.append(result)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print the change against the baseline and return the list of
+    regressions, i.e. cases more than threshold slower per op."""
+    old = dict(((r['name'], r['n']), r) for r in baseline['results'])
+    regressions = []
+    for r in results:
+        key = (r['name'], r['n'])
+        if( key not in old ):
+            continue
+        ratio = r['nsPerOp'] / old[key]['nsPerOp']
+        flag = ''
+        if( ratio > 1. + threshold ):
+            flag = '  REGRESSION'
+            regressions.append((key, ratio))
+        print('%-24s %9d %8.3fx%s' % (key[0], key[1], ratio, flag))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--sizes', default='1000,100000,1000000',
+                        help='comma separated event counts')
+    parser.add_argument('--max-scalar', type=int, default=100000,
+                        help='largest event count for per-event cases')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=12345)
+    parser.add_argument('--select', action='append',
+                        help='only run cases whose name contains this')
+    parser.add_argument('--output', help='write results as JSON')
+    parser.add_argument('--baseline', help='JSON results to compare with')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='allowed slowdown per op, e.g. 0.1 for 10%%')
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(',')]
+    results = runAll(sizes, args.max_scalar, args.repeat, args.seed,
+                     args.select)
+    output = {'meta': {'python': platform.python_version(),
+                       'numpy': np.__version__,
+                       'platform': platform.platform(),
+                       'time': time.strftime('%Y-%m-%dT%H:%M:%S')},
+              'results': results}
+    if( args.output ):
+        with open(args.output, 'w') as f:
+            json.dump(output, f, indent=1)
+    if( args.baseline ):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if( compare(results, baseline, args.threshold) ):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
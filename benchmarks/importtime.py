@@ -0,0 +1,149 @@
+"""Import-time benchmark for the decaysim package.
+
+Run from the repository root:
+
+    python benchmarks/importtime.py --output imports.json
+    python benchmarks/importtime.py --baseline imports.json --threshold 0.25
+
+Every import is timed in a fresh interpreter (best of --repeat runs), the
+way a new worker process pays it. It reports the time of the import itself,
+the wall time of the whole process, and which heavy optional dependencies
+(numpy, ROOT, pypdt) the import pulled in. The exit status is 1 if a core
+import exceeds --budget milliseconds or loads an optional dependency, or if
+any import got slower than the threshold allows against a baseline.
+"""
+from __future__ import division, print_function
+from timeit import default_timer as _timer
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_heavy = ('numpy', 'ROOT', 'pypdt')
+
+#Each case maps a name to (import statement, isCore).
+CASES = [
+    ('python', 'pass', True),
+    ('decaysim', 'import decaysim', True),
+    ('decaysim.vector', 'from decaysim import vector', True),
+    ('decaysim.particle', 'from decaysim import particle', True),
+    ('decaysim.histplot', 'from decaysim import histplot', True),
+    ('decaysim.profiling', 'from decaysim import profiling', True),
+    ('decaysim.distributions', 'from decaysim import distributions', False),
+    ('decaysim.batchdecay', 'from decaysim import batchdecay', False),
+    ('decaysim.stream', 'from decaysim import stream', False),
+    ('decaysim.parallel', 'from decaysim import parallel', False),
+]
+
+_script = '''
+import sys
+from timeit import default_timer as _timer
+start = _timer()
+%s
+seconds = _timer() - start
+print(repr((seconds, [m for m in %r if m in sys.modules])))
+'''
+
+
+def runCase(statement, repeat):
+    """Return the best import and process times and the heavy modules
+    loaded by statement in a fresh interpreter."""
+    best = float('inf')
+    bestWall = float('inf')
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [_root] + [p for p in [env.get('PYTHONPATH')] if p])
+    for i in range(repeat):
+        start = _timer()
+        out = subprocess.check_output(
+            [sys.executable, '-c', _script % (statement, _heavy)], env=env)
+        bestWall = min(bestWall, _timer() - start)
+        seconds, loaded = eval(out.decode().strip().splitlines()[-1])
+        best = min(best, seconds)
+    return best, bestWall, loaded
+
+
+def runAll(repeat, select=None):
+    results = []
+    for name, statement, isCore in CASES:
+        if( select and not any(s in name for s in select) ):
+            continue
+        seconds, wall, loaded = runCase(statement, repeat)
+        result = {'name': name, 'core': isCore, 'seconds': seconds,
+                  'processSeconds': wall, 'loaded': loaded}
+        print('%-24s %10.2f ms %10.2f ms  %s' % (
+            name, 1e3 * seconds, 1e3 * wall, ','.join(loaded) or '-'))
+        results.append(result)
+    return results
+
+
+def check(results, budget):
+    """Return the core imports over budget (in s) or loading optional
+    dependencies."""
+    failures = []
+    for r in results:
+        if( not r['core'] ):
+            continue
+        if( r['seconds'] > budget or r['loaded'] ):
+            failures.append(r['name'])
+            print('%-24s over budget or loads %s' % (
+                r['name'], ','.join(r['loaded']) or 'nothing'))
+    return failures
+
+
+def compare(results, baseline, threshold):
+    """Print the change against the baseline and return the list of
+    regressions, i.e. imports more than threshold slower."""
+    old = dict((r['name'], r) for r in baseline['results'])
+    regressions = []
+    for r in results:
+        if( r['name'] not in old or old[r['name']]['seconds'] <= 0 ):
+            continue
+        ratio = r['seconds'] / old[r['name']]['seconds']
+        flag = ''
+        if( ratio > 1. + threshold ):
+            flag = '  REGRESSION'
+            regressions.append((r['name'], ratio))
+        print('%-24s %8.3fx%s' % (r['name'], ratio, flag))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--select', action='append',
+                        help='only run cases whose name contains this')
+    parser.add_argument('--budget', type=float, default=20.,
+                        help='allowed import time of core modules in ms')
+    parser.add_argument('--output', help='write results as JSON')
+    parser.add_argument('--baseline', help='JSON results to compare with')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='allowed slowdown, e.g. 0.25 for 25%%')
+    args = parser.parse_args(argv)
+
+    print('%-24s %13s %13s  %s' % ('import', 'import', 'process', 'loaded'))
+    results = runAll(args.repeat, args.select)
+    output = {'meta': {'python': platform.python_version(),
+                       'platform': platform.platform(),
+                       'time': time.strftime('%Y-%m-%dT%H:%M:%S')},
+              'results': results}
+    if( args.output ):
+        with open(args.output, 'w') as f:
+            json.dump(output, f, indent=1)
+    status = 0
+    if( check(results, 1e-3 * args.budget) ):
+        status = 1
+    if( args.baseline ):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if( compare(results, baseline, args.threshold) ):
+            status = 1
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,24 @@
+"""Simulation of relativistic particle decays.
+
+The scalar core (vector and particle) is imported with the package and
+needs only the standard library. The other submodules, most of which need
+NumPy, are imported on first use as decaysim.<name> or with
+from decaysim import <name>; ROOT and pypdt are only imported by the
+functions that use them."""
+from __future__ import division, print_function
+from .vector import VecThree, VecFour, LorentzBoost
+from .particle import Particle, Mother, KnownParticle
+
+_submodules = ('angular', 'batchdecay', 'chain', 'distributions',
+               'eventstore', 'histogram', 'histplot', 'importance', 'ntuple',
+               'onlinestats', 'parallel', 'pdgtable', 'profiling',
+               'samplers', 'selection', 'smearing', 'stream', 'utils',
+               'vectorarray')
+
+
+def __getattr__(name):
+    """Import the lazy submodules on attribute access (Python >= 3.7)."""
+    if( name in _submodules ):
+        import importlib
+        return importlib.import_module('.' + name, __name__)
+    raise AttributeError('module %r has no attribute %r' % (__name__, name))
@@ -0,0 +1,137 @@
+from __future__ import division, print_function
+import numpy as _np
+from .distributions import getStream
+
+
+class AngularDistribution(object):
+    """Distribution of cos(theta) of the first daughter in the mother's rest
+    frame. PDF(c) is normalized on [-1, 1] and Sample(size, rng) returns
+    cos(theta) values, a float if size is None. Models are also samplers
+    f(n, rng) as used by stream.generateChunks."""
+
+
+    def PDF(self, c):
+        raise NotImplementedError
+
+
+    def Sample(self, size=None, rng=None):
+        raise NotImplementedError
+
+
+    def __call__(self, n, rng):
+        return self.Sample(n, rng)
+
+
+class Isotropic(AngularDistribution):
+    """Uniform in cos(theta), i.e. isotropic decays."""
+
+
+    def PDF(self, c):
+        return 0.5 * _np.ones_like(_np.asarray(c, dtype=_np.float64))
+
+
+    def Sample(self, size=None, rng=None):
+        return 2 * getStream(rng).random(size) - 1
+
+
+class UniformTheta(AngularDistribution):
+    """Uniform in theta on [0, pi], what Mother.Decay drew before angular
+    distributions were added. Kept for reproducing old samples."""
+
+
+    def PDF(self, c):
+        c = _np.asarray(c, dtype=_np.float64)
+        with _np.errstate(divide='ignore'):
+            return 1. / (_np.pi * _np.sqrt(1. - c * c))
+
+
+    def Sample(self, size=None, rng=None):
+        return _np.cos(_np.pi * getStream(rng).random(size))
+
+
+class OnePlusCos2(AngularDistribution):
+    """Proportional to 1 + a cos^2(theta), e.g. a = 1 for Z -> ll. For
+    a >= 0 it is sampled by inverting the cubic CDF analytically, for
+    -1 <= a < 0 by accept-reject."""
+
+
+    def __init__(self, a=1.):
+        assert (a >= -1), 'The pdf must be non-negative.'
+        self.a = a
+        self._norm = 2. + 2. * a / 3.
+        if( a < 0 ):
+            self._fallback = AcceptReject(lambda c: 1. + a * c * c, bound=1.)
+        return
+
+
+    def PDF(self, c):
+        c = _np.asarray(c, dtype=_np.float64)
+        return (1. + self.a * c * c) / self._norm
+
+
+    def Sample(self, size=None, rng=None):
+        a = self.a
+        if( a < 0 ):
+            return self._fallback.Sample(size, rng)
+        u = getStream(rng).random(size)
+        if( a == 0 ):
+            return 2 * u - 1
+        #Solve a c^3/3 + c + 1 + a/3 - u*norm = 0 with Cardano's formula.
+        p = 3. / a
+        q = 3. * (1. + a / 3. - u * self._norm) / a
+        d = _np.sqrt(0.25 * q * q + p**3 / 27.)
+        c = _np.cbrt(-0.5 * q + d) + _np.cbrt(-0.5 * q - d)
+        return _np.clip(c, -1., 1.)
+
+
+class AcceptReject(AngularDistribution):
+    """Any pdf on [-1, 1] sampled by vectorized accept-reject against a
+    flat envelope. Candidates are drawn in batches oversized by the
+    expected acceptance, so few passes are needed. bound is an upper bound
+    of pdf, found on a grid if not given; pdf need not be normalized."""
+
+
+    def __init__(self, pdf, bound=None, oversample=1.2):
+        self._pdf = pdf
+        if( bound is None ):
+            bound = 1.05 * float(_np.max(pdf(_np.linspace(-1, 1, 2001))))
+        self.bound = bound
+        self._oversample = oversample
+        grid = _np.linspace(-1, 1, 20001)
+        mid = 0.5 * (grid[1:] + grid[:-1])
+        self._norm = 2. * float(_np.mean(pdf(mid)))
+        self._efficiency = self._norm / (2. * bound)
+        return
+
+
+    def PDF(self, c):
+        return self._pdf(_np.asarray(c, dtype=_np.float64)) / self._norm
+
+
+    def Sample(self, size=None, rng=None):
+        rng = getStream(rng)
+        n = 1 if size is None else int(_np.prod(size))
+        out = _np.empty(n)
+        done = 0
+        while( done < n ):
+            want = int((n - done) * self._oversample / self._efficiency) + 16
+            c = 2 * rng.random(want) - 1
+            keep = c[rng.random(want) * self.bound < self._pdf(c)]
+            take = min(len(keep), n - done)
+            out[done:done + take] = keep[:take]
+            done += take
+        if( size is None ):
+            return float(out[0])
+        return out.reshape(size)
+
+
+class Polynomial(AcceptReject):
+    """Proportional to sum_k coeffs[k] cos^k(theta), sampled by
+    accept-reject. The polynomial must be non-negative on [-1, 1]."""
+
+
+    def __init__(self, coeffs, oversample=1.2):
+        self.coeffs = list(coeffs)
+        poly = _np.polynomial.polynomial.Polynomial(self.coeffs)
+        super(Polynomial, self).__init__(poly, oversample=oversample)
+        return
@@ -0,0 +1,181 @@
+from __future__ import division, print_function
+import numpy as _np
+from .vectorarray import VecThreeArray, VecFourArray, LorentzBoostArray
+from .distributions import getStream
+from .profiling import getProfiler
+from .angular import Isotropic
+
+
+_isotropic = Isotropic()
+
+
+def particleBatch(m, pt, pz=0, n=None, rng=None):
+    """Return a VecFourArray of mothers built like Particle: pt and pz are
+    scalars or per-event arrays and phi is drawn uniformly. n is the batch
+    size when every argument is a scalar."""
+    rng = getStream(rng)
+    m, pt, pz = _np.broadcast_arrays(*[_np.asarray(a, dtype=_np.float64)
+                                       for a in (m, pt, pz)])
+    if( n is None ):
+        n = m.size
+    phi = _np.pi * (2 * rng.random(n) - 1)
+    vec = VecFourArray.Empty(n)
+    d = vec.Data()
+    d[0] = pt * _np.cos(phi)
+    d[1] = pt * _np.sin(phi)
+    d[2] = pz
+    d[3] = _np.sqrt(vec.P2() + m**2)
+    return vec
+
+
+def decayBatch(mothers, dM1=0, dM2=0, rng=None, m=None, epsilon=1e-7,
+               out=None, profiler=None, angular=None, cosTheta=None,
+               phi=None):
+    """Decay a batch of mothers into two daughters each. This is the batch
+    equivalent of Mother.Decay: mothers is a VecFourArray, the masses may be
+    scalars or per-event arrays and m defaults to the mothers' invariant
+    mass. Return the two daughter VecFourArrays and the isGood mask.
+    Passing out=(d1, d2) writes the daughters into preallocated batches.
+    With a profiling.Profiler the boost is timed as its own stage and
+    isGood=False events are counted. angular is an
+    angular.AngularDistribution for cos(theta) of the first daughter,
+    isotropic by default. cosTheta and phi override the randomly drawn
+    rest-frame angles, e.g. with importance-sampled ones."""
+    rng = getStream(rng)
+    profiler = getProfiler(profiler)
+    n = len(mothers)
+    if( m is None ):
+        m = mothers.M()
+    m = _np.asarray(m, dtype=_np.float64)
+    dM1 = _np.asarray(dM1, dtype=_np.float64)
+    dM2 = _np.asarray(dM2, dtype=_np.float64)
+    assert _np.all(m != 0), 'Can\'t decay massless particles!'
+    assert _np.all(dM1 + dM2 <= m), 'Daughter masses violate CoE!'
+
+    if( phi is None ):
+        phi = _np.pi * (2 * rng.random(n) - 1)
+    if( cosTheta is None ):
+        cosTheta = (_isotropic if angular is None else angular).Sample(n, rng)
+
+    e1rest = (m**2 + dM1**2 - dM2**2)/(2*m)
+    e2rest = m - e1rest
+    pDaughters = _np.sqrt(e1rest**2 - dM1**2)
+
+    sinTheta = _np.sqrt(1. - cosTheta * cosTheta)
+    if( out is None ):
+        d1 = VecFourArray.Empty(n)
+        d2 = VecFourArray.Empty(n)
+    else:
+        d1, d2 = out
+    a = d1.Data()
+    a[0] = pDaughters * sinTheta * _np.cos(phi)
+    a[1] = pDaughters * sinTheta * _np.sin(phi)
+    a[2] = pDaughters * cosTheta
+    a[3] = e1rest
+    b = d2.Data()
+    _np.negative(a[:3], out=b[:3])
+    b[3] = e2rest
+
+    with profiler.Stage('boost', n):
+        boost = LorentzBoostArray.FromVectors(mothers)
+        boost.Apply(d1)
+        boost.Apply(d2)
+
+    isGood = ~((d1.M2() - dM1**2 > epsilon) |
+               (d2.M2() - dM2**2 > epsilon))
+    if( profiler.enabled ):
+        profiler.Count('isGood=False', n - int(isGood.sum()))
+    return d1, d2, isGood
+
+
+def _Pdk(a, b, c):
+    """Return the momentum of the two-body decay a -> b c."""
+    x = (a - b - c)*(a + b + c)*(a - b + c)*(a + b - c)
+    return _np.sqrt(_np.maximum(x, 0.)) / (2 * a)
+
+
+def _Isotropic(p, n, rng):
+    """Return isotropically oriented (3, n) momenta of magnitude p."""
+    cosTheta = 2 * rng.random(n) - 1
+    sinTheta = _np.sqrt(1. - cosTheta * cosTheta)
+    phi = _np.pi * (2 * rng.random(n) - 1)
+    return p * _np.array([sinTheta * _np.cos(phi), sinTheta * _np.sin(phi),
+                          cosTheta])
+
+
+def decayBatchN(mothers, masses, rng=None, m=None, epsilon=1e-7, out=None,
+                profiler=None):
+    """Decay a batch of mothers into len(masses) daughters each, uniformly
+    in N-body phase space (the GENBOD algorithm of CERNLIB). masses may be
+    scalars or per-event arrays and m defaults to the mothers' invariant
+    mass. Return the list of daughter VecFourArrays, the phase-space
+    weights and the isGood mask. The weights are bounded by 1 but their
+    actual maximum can be far below it, so for efficient unweighting keep
+    the events with weight > u * wmax for a uniform u and an empirical
+    maximum wmax, or keep them as event weights. Passing out writes the
+    daughters into preallocated batches. For two daughters the weight is
+    always 1 and the kinematics are those of decayBatch."""
+    rng = getStream(rng)
+    profiler = getProfiler(profiler)
+    n = len(mothers)
+    nd = len(masses)
+    assert (nd >= 2), 'A decay needs at least two daughters!'
+    if( m is None ):
+        m = mothers.M()
+    m = _np.asarray(m, dtype=_np.float64)
+    masses = [_np.asarray(dM, dtype=_np.float64) for dM in masses]
+    total = sum(masses)
+    assert _np.all(m != 0), 'Can\'t decay massless particles!'
+    assert _np.all(total <= m), 'Daughter masses violate CoE!'
+
+    #Invariant masses of the subsystems of the first k + 1 daughters.
+    kinetic = m - total
+    r = _np.sort(rng.random((nd - 2, n)), axis=0)
+    subMasses = [masses[0]]
+    summed = masses[0]
+    for k in range(1, nd - 1):
+        summed = summed + masses[k]
+        subMasses.append(summed + r[k - 1] * kinetic)
+    subMasses.append(m)
+
+    #Weight bounded by 1 (ROOT's fWtMax normalisation).
+    weights = _np.ones(n)
+    emmax = kinetic + masses[0]
+    emmin = 0.
+    pd = []
+    for k in range(nd - 1):
+        pd.append(_Pdk(subMasses[k + 1], subMasses[k], masses[k + 1]))
+        emmin = emmin + masses[k]
+        emmax = emmax + masses[k + 1]
+        weights *= pd[k] / _Pdk(emmax, emmin, masses[k + 1])
+
+    #Build the daughters in the rest frame of each subsystem in turn.
+    buf = _np.empty((nd, 4, n))
+    p = _Isotropic(pd[0], n, rng)
+    buf[0, :3] = p
+    buf[0, 3] = _np.sqrt(pd[0]**2 + masses[0]**2)
+    buf[1, :3] = -p
+    buf[1, 3] = _np.sqrt(pd[0]**2 + masses[1]**2)
+    with profiler.Stage('boost', n):
+        for k in range(1, nd - 1):
+            p = _Isotropic(pd[k], n, rng)
+            buf[k + 1, :3] = -p
+            buf[k + 1, 3] = _np.sqrt(pd[k]**2 + masses[k + 1]**2)
+            beta = p / _np.sqrt(pd[k]**2 + subMasses[k]**2)
+            LorentzBoostArray.FromBeta(VecThreeArray(data=beta)).Apply(
+                VecFourArray(data=buf[:k + 1].transpose(1, 0, 2)))
+        LorentzBoostArray.FromVectors(mothers).Apply(
+            VecFourArray(data=buf.transpose(1, 0, 2)))
+
+    if( out is None ):
+        daughters = [VecFourArray(data=buf[i]) for i in range(nd)]
+    else:
+        daughters = list(out)
+        for i in range(nd):
+            daughters[i].Data()[...] = buf[i]
+    isGood = _np.ones(n, dtype=bool)
+    for d, dM in zip(daughters, masses):
+        isGood &= ~(d.M2() - dM**2 > epsilon)
+    if( profiler.enabled ):
+        profiler.Count('isGood=False', n - int(isGood.sum()))
+    return daughters, weights, isGood
@@ -0,0 +1,126 @@
+from __future__ import division, print_function
+import numpy as _np
+from .vectorarray import VecFourArray
+from .distributions import getStream
+from .batchdecay import decayBatch, decayBatchN
+
+
+class DecayNode(object):
+    """One particle of a decay tree. A node has either no daughters, two, or
+    more, in which case they are spread over N-body phase space, e.g.
+        DecayNode('Z', 91.188, [DecayNode('W+', 80.379, [DecayNode('l', 0),
+                                                          DecayNode('nu', 0)]),
+                                DecayNode('W-', 80.379, [DecayNode('q', 0),
+                                                          DecayNode('qbar', 0)])])
+    angular is the angular.AngularDistribution of its decay, isotropic if
+    None.
+    """
+
+
+    def __init__(self, name, m, daughters=(), angular=None):
+        self.name = name
+        self.m = m
+        self.daughters = list(daughters)
+        self.angular = angular
+        return
+
+
+    def IsFinalState(self):
+        """Return True if the node does not decay."""
+        return len(self.daughters) == 0
+
+
+class DecayChain(object):
+    """Decay tree compiled once into a flat list of two-body steps, which is
+    then run over batches of mothers. Intermediate four-vectors live in
+    buffers owned by the chain and reused from one batch to the next."""
+
+
+    def __init__(self, root, epsilon=1e-7):
+        self.root = root
+        self._epsilon = epsilon
+        self._nodes = []
+        self._steps = []
+        self._Compile()
+        self._capacity = 0
+        self._buffers = []
+        return
+
+
+    def _Compile(self):
+        """Number the nodes breadth-first and record one step per decay, so
+        every parent is produced before its daughters are boosted into it."""
+        queue = [self.root]
+        while( queue ):
+            node = queue.pop(0)
+            self._nodes.append(node)
+            queue.extend(node.daughters)
+        names = [node.name for node in self._nodes]
+        if( len(set(names)) != len(names) ):
+            raise RuntimeError('Node names in a decay chain must be unique.')
+        index = dict((id(node), i) for i, node in enumerate(self._nodes))
+        for i, node in enumerate(self._nodes):
+            if( node.IsFinalState() ):
+                continue
+            if( len(node.daughters) < 2 ):
+                raise RuntimeError('%s must have at least two daughters.' %
+                                   node.name)
+            assert (node.m != 0), 'Can\'t decay massless particles!'
+            assert (sum(d.m for d in node.daughters) <= node.m), \
+                'Daughter masses violate CoE!'
+            self._steps.append((i, tuple(index[id(d)] for d in
+                                         node.daughters)))
+        return
+
+
+    def Names(self):
+        """Return the node names in execution order."""
+        return [node.name for node in self._nodes]
+
+
+    def _Reserve(self, n):
+        """Make sure every buffer can hold n events."""
+        if( n > self._capacity ):
+            self._buffers = [_np.empty((4, n), dtype=_np.float64)
+                             for node in self._nodes]
+            self._capacity = n
+        return [VecFourArray(data=b[:, :n]) for b in self._buffers]
+
+
+    def Generate(self, mothers, rng=None, m=None, profiler=None,
+                 weights=None):
+        """Run the chain over a VecFourArray of root momenta. m is the root
+        mass (scalar or per-event) and defaults to the root node's mass.
+        Return a dict of name -> VecFourArray and the combined isGood mask.
+        The returned batches are views of the chain's buffers and are
+        overwritten by the next call. The phase-space weights of N-body
+        decays are multiplied into the array weights if given."""
+        rng = getStream(rng)
+        n = len(mothers)
+        vecs = self._Reserve(n)
+        vecs[0].Data()[...] = mothers.Data()
+        if( m is None ):
+            m = self.root.m
+        isGood = _np.ones(n, dtype=bool)
+        for parent, daughters in self._steps:
+            node = self._nodes[parent]
+            mass = m if parent == 0 else node.m
+            if( len(daughters) == 2 ):
+                i1, i2 = daughters
+                d1, d2, good = decayBatch(vecs[parent], self._nodes[i1].m,
+                                          self._nodes[i2].m, rng, mass,
+                                          self._epsilon,
+                                          out=(vecs[i1], vecs[i2]),
+                                          profiler=profiler,
+                                          angular=node.angular)
+            else:
+                ds, w, good = decayBatchN(vecs[parent],
+                                          [self._nodes[i].m for i in
+                                           daughters], rng, mass,
+                                          self._epsilon,
+                                          out=[vecs[i] for i in daughters],
+                                          profiler=profiler)
+                if( weights is not None ):
+                    weights *= w
+            isGood &= good
+        return dict(zip(self.Names(), vecs)), isGood
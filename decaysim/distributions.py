@@ -0,0 +1,139 @@
+from __future__ import division, print_function
+from math import sqrt as _sqrt, log as _log
+import numpy as _np
+from .pdgtable import defaultTable
+
+
+class RandomStream(object):
+    """Random number stream backed by a NumPy Generator seeded from a
+    SeedSequence. Independent child streams for parallel workers are made
+    with Spawn(). A numpy.random.Generator can be used anywhere a
+    RandomStream is accepted."""
+
+
+    def __init__(self, seed=None):
+        if( isinstance(seed, _np.random.SeedSequence) ):
+            self.seedSequence = seed
+        else:
+            self.seedSequence = _np.random.SeedSequence(seed)
+        self.generator = _np.random.Generator(_np.random.PCG64(
+            self.seedSequence))
+        return
+
+
+    def Spawn(self, n):
+        """Return a list of n independent child streams."""
+        return [RandomStream(s) for s in self.seedSequence.spawn(n)]
+
+
+    def random(self, size=None):
+        """Return random numbers on the interval [0, 1)."""
+        return self.generator.random(size)
+
+
+    def uniform(self, minimum=0., maximum=1., size=None):
+        """Return random numbers on the interval [minimum, maximum)."""
+        return self.generator.uniform(minimum, maximum, size)
+
+
+    def exponential(self, scale=1., size=None):
+        """Return exponentially distributed numbers with mean scale."""
+        return self.generator.exponential(scale, size)
+
+
+    def normal(self, loc=0., scale=1., size=None):
+        """Return gaussian distributed numbers."""
+        return self.generator.normal(loc, scale, size)
+
+
+_stream = RandomStream()
+
+
+def seed(s=None):
+    """Reseed the default streams used when no rng is given, this one and
+    the scalar one of particle. s is anything RandomStream accepts; the
+    particle stream is seeded from the same SeedSequence."""
+    global _stream
+    stream = RandomStream(s)
+    from .particle import seed as _seedParticles
+    _seedParticles(int(stream.seedSequence.generate_state(1)[0]))
+    _stream = stream
+    return
+
+
+def getStream(rng=None):
+    """Return rng, or the default stream if rng is None."""
+    if( rng is None ):
+        return _stream
+    return rng
+
+
+def uniform(minimum, maximum, size=None, rng=None):
+    """Return random numbers distributed uniformly on [minimum, maximum).
+    With size=None a single float is returned, otherwise an array."""
+    return getStream(rng).uniform(minimum, maximum, size)
+
+
+def randExp(lambd=250, minimum=50, size=None, rng=None):
+    """Return a random exponentially distributed value. Default has a
+    minimum of 50 and a stdev of 250."""
+    return getStream(rng).exponential(lambd, size) + minimum
+
+
+def zMass(mZ=91.188, wZ=2.495, size=None, rng=None, shape='gauss',
+          minimum=None, maximum=None):
+    """Return a gaussian distribution. Default has a mean of 91.188 and a
+    width of 2.495. shape='breitwigner' draws from a relativistic
+    Breit-Wigner line shape instead, on [minimum, maximum] if given, e.g.
+    minimum at the threshold of the decay."""
+    if( shape == 'breitwigner' ):
+        from .samplers import breitWigner
+        return breitWigner(mZ, wZ, minimum, maximum)(size, rng)
+    return getStream(rng).normal(mZ, wZ * (2*_sqrt(2*_log(2))), size)
+
+
+def randMom(m, size=None, rng=None):
+    """Return a random number distributed uniformly on the interval (-m, m)."""
+    return  m * (2 * getStream(rng).random(size) - 1)
+
+
+_pdgCache = {}
+
+
+def pdgProperties(pdgid):
+    """Return (mass, width) of a particle, looked up only once per PDG id.
+    The bundled pdgtable is used first and pypdt, imported only then, for
+    particles missing from it."""
+    if( pdgid not in _pdgCache ):
+        table = defaultTable()
+        if( pdgid in table ):
+            particle = table.Get(pdgid)
+        else:
+            try:
+                import pypdt
+            except ImportError:
+                raise RuntimeError('PDG id %d is not in the bundled table; '
+                                   'install pypdt from pypi to look it up.'
+                                   % pdgid)
+            particle = pypdt.get(pdgid)
+        _pdgCache[pdgid] = (particle.mass, particle.width)
+    return _pdgCache[pdgid]
+
+
+def massPDG(pdgid, size=None, rng=None, shape='gauss', minimum=None,
+            maximum=None):
+    """Mass distribution with mass and width of a chosen particle. Accept
+    the Particle Data Group ID as the first argument. shape is 'gauss' or
+    'breitwigner' for a relativistic Breit-Wigner line shape, limited to
+    [minimum, maximum] if given."""
+    if( shape == 'gauss' ):
+        mass, width = pdgProperties(pdgid)
+        return getStream(rng).normal(mass, width / (2*_sqrt(2*_log(2))), size)
+    from .samplers import pdgSampler
+    return pdgSampler(pdgid, shape, minimum, maximum)(size, rng)
+
+
+def random(size=None, rng=None):
+    """Return a random number on the interval [0, 1)."""
+    return getStream(rng).random(size)
+
@@ -0,0 +1,107 @@
+from __future__ import division, print_function
+import json
+import os
+import numpy as _np
+from .vectorarray import VecFourArray
+from .stream import EventChunk
+from .ntuple import ColumnWriter, ColumnReader, readHeader, COMPONENTS
+
+
+def _Normalize(params):
+    """Return params as plain JSON types so stored and requested parameters
+    compare equal."""
+    return json.loads(json.dumps(params, sort_keys=True))
+
+
+def createStore(path, params, particles=('mother', 'd1', 'd2')):
+    """Return a ColumnWriter for a new event store at path holding the
+    four-vectors of the named particles plus isGood, veto and weight.
+    params are the generation parameters (masses, mass distribution, seed,
+    ...) and are recorded in the header. Feed it with writer.Stage(chunks)."""
+    columns = ['%s_%s' % (name, comp) for name in particles
+               for comp in COMPONENTS]
+    columns += [('isGood', bool), ('veto', bool), 'weight']
+    metadata = {'particles': list(particles), 'params': _Normalize(params)}
+    return ColumnWriter(path, columns, metadata)
+
+
+class EventStore(object):
+    """Read-only view of a stored sample. Columns are memory-mapped, so a
+    scan only touches the pages of the columns it reads."""
+
+
+    def __init__(self, path):
+        self.path = path
+        self.reader = ColumnReader(path)
+        self.particles = self.reader.metadata['particles']
+        self.params = self.reader.metadata['params']
+        return
+
+
+    def __len__(self):
+        return len(self.reader)
+
+
+    def Column(self, name):
+        """Return a column, e.g. 'd1_px' or 'isGood', as a memmap."""
+        return self.reader[name]
+
+
+    def Particle(self, name, start=0, stop=None):
+        """Return rows [start, stop) of a particle as a VecFourArray."""
+        if( stop is None ):
+            stop = len(self)
+        data = _np.empty((4, max(stop - start, 0)), dtype=_np.float64)
+        for i, comp in enumerate(COMPONENTS):
+            data[i] = self.reader['%s_%s' % (name, comp)][start:stop]
+        return VecFourArray(data=data)
+
+
+    def Chunks(self, chunkSize=1000000, particles=None):
+        """Yield the stored events as EventChunks, reading only the named
+        particles (default all), ready for the stream stages."""
+        if( particles is None ):
+            particles = self.particles
+        for start in range(0, len(self), chunkSize):
+            stop = min(start + chunkSize, len(self))
+            vecs = dict((name, self.Particle(name, start, stop))
+                        for name in particles)
+            weights = None
+            if( 'weight' in self.reader.dtypes ):
+                weights = _np.array(self.reader['weight'][start:stop])
+            yield EventChunk(vecs,
+                             _np.array(self.reader['isGood'][start:stop]),
+                             _np.array(self.reader['veto'][start:stop]),
+                             weights)
+
+
+def findStore(root, params, nEvents=0):
+    """Return the path of a store under root generated with the same
+    params and holding at least nEvents events, or None."""
+    params = _Normalize(params)
+    if( not os.path.isdir(root) ):
+        return None
+    for entry in sorted(os.listdir(root)):
+        path = os.path.join(root, entry)
+        try:
+            header = readHeader(path)
+        except (IOError, OSError, ValueError, RuntimeError):
+            continue
+        if( header['metadata'].get('params') == params and
+            header['nrows'] >= nEvents ):
+            return path
+    return None
+
+
+def openOrGenerate(root, name, params, nEvents, generate):
+    """Reuse a matching store under root, or run generate(writer) to fill
+    a new one at root/name first. Return the EventStore."""
+    path = findStore(root, params, nEvents)
+    if( path is None ):
+        path = os.path.join(root, name)
+        writer = createStore(path, params)
+        try:
+            generate(writer)
+        finally:
+            writer.Close()
+    return EventStore(path)
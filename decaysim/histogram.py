@@ -0,0 +1,209 @@
+from __future__ import division, print_function
+import numpy as _np
+
+
+def _BinIndex(values, nbins, minimum, maximum):
+    """Return the ROOT-style bin index of every value: 0 is the underflow,
+    nbins+1 the overflow and NaN goes to the overflow."""
+    x = (_np.asarray(values, dtype=_np.float64) - minimum) * (
+        nbins / (maximum - minimum))
+    x = _np.where(_np.isnan(x), nbins, x)
+    return (_np.floor(_np.clip(x, -1, nbins)) + 1).astype(_np.intp)
+
+
+class Hist1D(object):
+    """1D histogram filled from whole arrays, keeping the sum of weights
+    and the sum of squared weights (Sumw2) per bin. Bin 0 and nbins+1 are
+    the underflow and overflow, as in ROOT."""
+
+
+    def __init__(self, name, nbins, minimum, maximum, title='', xtitle='',
+                 ytitle=''):
+        self.name = name
+        self.nbins = nbins
+        self.minimum = minimum
+        self.maximum = maximum
+        self.title = title
+        self.xtitle = xtitle
+        self.ytitle = ytitle
+        self.sumw = _np.zeros(nbins + 2)
+        self.sumw2 = _np.zeros(nbins + 2)
+        self.entries = 0
+        return
+
+
+    def Fill(self, values, weights=None):
+        """Fill with a value or an array of values and optional weights."""
+        values = _np.atleast_1d(values)
+        idx = _BinIndex(values, self.nbins, self.minimum, self.maximum)
+        n = self.nbins + 2
+        if( weights is None ):
+            counts = _np.bincount(idx, minlength=n)
+            self.sumw += counts
+            self.sumw2 += counts
+        else:
+            w = _np.broadcast_to(_np.asarray(weights, dtype=_np.float64),
+                                 values.shape)
+            self.sumw += _np.bincount(idx, w, minlength=n)
+            self.sumw2 += _np.bincount(idx, w * w, minlength=n)
+        self.entries += values.size
+        return
+
+
+    def Contents(self):
+        """Return the bin contents without under- and overflow."""
+        return self.sumw[1:-1]
+
+
+    def Errors(self):
+        """Return the bin errors, sqrt(Sumw2), without under- and
+        overflow."""
+        return _np.sqrt(self.sumw2[1:-1])
+
+
+    def Edges(self):
+        """Return the nbins+1 bin edges."""
+        return _np.linspace(self.minimum, self.maximum, self.nbins + 1)
+
+
+    def Integral(self):
+        """Return the sum of the bin contents, excluding under- and
+        overflow, as TH1.Integral does."""
+        return float(self.sumw[1:-1].sum())
+
+
+    def Scale(self, c):
+        """Multiply the contents by c and the errors by |c|."""
+        self.sumw *= c
+        self.sumw2 *= c * c
+        return
+
+
+    def Merge(self, other):
+        """Add another histogram with the same binning, e.g. from a parallel
+        worker."""
+        if( self.sumw.shape != other.sumw.shape ):
+            raise RuntimeError('Cannot merge histograms with different '
+                               'binning.')
+        self.sumw += other.sumw
+        self.sumw2 += other.sumw2
+        self.entries += other.entries
+        return self
+
+
+    def ToROOT(self):
+        """Return an equivalent ROOT TH1F. ROOT is only imported here."""
+        from ROOT import TH1F
+        hist = TH1F(self.name, self.title, self.nbins, self.minimum,
+                    self.maximum)
+        hist.Sumw2()
+        hist.SetXTitle(self.xtitle)
+        hist.SetYTitle(self.ytitle)
+        for i in range(self.nbins + 2):
+            hist.SetBinContent(i, self.sumw[i])
+            hist.SetBinError(i, _np.sqrt(self.sumw2[i]))
+        hist.SetEntries(self.entries)
+        return hist
+
+
+class Hist2D(object):
+    """2D histogram filled from whole arrays, with the same conventions as
+    Hist1D. The contents are stored as (nxbins+2, nybins+2) arrays."""
+
+
+    def __init__(self, name, nxbins, xmin, xmax, nybins, ymin, ymax, title='',
+                 xtitle='', ytitle=''):
+        self.name = name
+        self.nxbins = nxbins
+        self.xmin = xmin
+        self.xmax = xmax
+        self.nybins = nybins
+        self.ymin = ymin
+        self.ymax = ymax
+        self.title = title
+        self.xtitle = xtitle
+        self.ytitle = ytitle
+        self.sumw = _np.zeros((nxbins + 2, nybins + 2))
+        self.sumw2 = _np.zeros((nxbins + 2, nybins + 2))
+        self.entries = 0
+        return
+
+
+    def Fill(self, xvalues, yvalues, weights=None):
+        """Fill with values or arrays of values and optional weights."""
+        xvalues = _np.atleast_1d(xvalues)
+        yvalues = _np.atleast_1d(yvalues)
+        ix = _BinIndex(xvalues, self.nxbins, self.xmin, self.xmax)
+        iy = _BinIndex(yvalues, self.nybins, self.ymin, self.ymax)
+        idx = ix * (self.nybins + 2) + iy
+        n = self.sumw.size
+        if( weights is None ):
+            counts = _np.bincount(idx, minlength=n).reshape(self.sumw.shape)
+            self.sumw += counts
+            self.sumw2 += counts
+        else:
+            w = _np.broadcast_to(_np.asarray(weights, dtype=_np.float64),
+                                 idx.shape)
+            self.sumw += _np.bincount(idx, w, minlength=n).reshape(
+                self.sumw.shape)
+            self.sumw2 += _np.bincount(idx, w * w, minlength=n).reshape(
+                self.sumw.shape)
+        self.entries += idx.size
+        return
+
+
+    def Contents(self):
+        """Return the bin contents without under- and overflow."""
+        return self.sumw[1:-1, 1:-1]
+
+
+    def Errors(self):
+        """Return the bin errors without under- and overflow."""
+        return _np.sqrt(self.sumw2[1:-1, 1:-1])
+
+
+    def Edges(self):
+        """Return the x and y bin edges."""
+        return (_np.linspace(self.xmin, self.xmax, self.nxbins + 1),
+                _np.linspace(self.ymin, self.ymax, self.nybins + 1))
+
+
+    def Integral(self):
+        """Return the sum of the bin contents, excluding under- and
+        overflow."""
+        return float(self.sumw[1:-1, 1:-1].sum())
+
+
+    def Scale(self, c):
+        """Multiply the contents by c and the errors by |c|."""
+        self.sumw *= c
+        self.sumw2 *= c * c
+        return
+
+
+    def Merge(self, other):
+        """Add another histogram with the same binning."""
+        if( self.sumw.shape != other.sumw.shape ):
+            raise RuntimeError('Cannot merge histograms with different '
+                               'binning.')
+        self.sumw += other.sumw
+        self.sumw2 += other.sumw2
+        self.entries += other.entries
+        return self
+
+
+    def ToROOT(self):
+        """Return an equivalent ROOT TH2F. ROOT is only imported here."""
+        from ROOT import TH2F
+        hist = TH2F(self.name, self.title, self.nxbins, self.xmin, self.xmax,
+                    self.nybins, self.ymin, self.ymax)
+        hist.Sumw2()
+        hist.SetXTitle(self.xtitle)
+        hist.SetYTitle(self.ytitle)
+        for i in range(self.nxbins + 2):
+            for j in range(self.nybins + 2):
+                b = hist.GetBin(i, j)
+                hist.SetBinContent(b, self.sumw[i, j])
+                hist.SetBinError(b, _np.sqrt(self.sumw2[i, j]))
+        hist.SetEntries(self.entries)
+        return hist
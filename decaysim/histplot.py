@@ -0,0 +1,356 @@
+from __future__ import division, print_function
+from array import array as _array
+import os
+
+
+def _ROOT():
+    """Import ROOT on first use, so the numpy backend works without it."""
+    import ROOT
+    return ROOT
+
+
+def _RenderROOT(plots, filepath, filetype, multipage):
+    """Draw plots, a list of (name, histogram, is2D), on one ROOT canvas.
+    multipage is False or the name of the single output file."""
+    ROOT = _ROOT()
+    ROOT.gROOT.SetBatch(True)
+    c = ROOT.TCanvas('plotsCanvas', 'plots')
+    c.SetLeftMargin(0.15)
+    c.SetBottomMargin(0.15)
+    written = []
+    if( multipage ):
+        path = '%s%s.%s' % (filepath, multipage, filetype)
+        c.Print(path + '[')
+    for name, hist, is2D in plots:
+        if( hasattr(hist, 'ToROOT') ):
+            hist = hist.ToROOT()
+        hist.GetYaxis().SetTitleOffset(1.6)
+        hist.GetXaxis().SetTitleOffset(1.6)
+        hist.Draw('LEGO2 E' if is2D else 'E')
+        if( multipage ):
+            c.Print(path, 'Title:' + name)
+        else:
+            written.append('%s%s.%s' % (filepath, name, filetype))
+            c.Print(written[-1])
+    if( multipage ):
+        c.Print(path + ']')
+        written.append(path)
+    return written
+
+
+def _RenderMatplotlib(plots, filepath, filetype, multipage):
+    """Draw numpy-backend plots with matplotlib, reusing one figure and
+    without pyplot's global state. multipage is False or the name of the
+    single output file, which must then be a pdf."""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    written = []
+    pages = None
+    if( multipage ):
+        from matplotlib.backends.backend_pdf import PdfPages
+        path = '%s%s.%s' % (filepath, multipage, filetype)
+        pages = PdfPages(path)
+    rebuild = True
+    try:
+        for name, hist, is2D in plots:
+            #Axes are rebuilt only after a 2D plot added a colorbar.
+            if( rebuild ):
+                fig.clf()
+                ax = fig.add_subplot(111)
+            else:
+                ax.cla()
+            if( is2D ):
+                xedges, yedges = hist.Edges()
+                mesh = ax.pcolormesh(xedges, yedges, hist.Contents().T)
+                fig.colorbar(mesh, ax=ax)
+            else:
+                edges = hist.Edges()
+                centers = 0.5 * (edges[1:] + edges[:-1])
+                ax.hist(centers, bins=edges, weights=hist.Contents(),
+                        histtype='step')
+                ax.errorbar(centers, hist.Contents(), yerr=hist.Errors(),
+                            fmt='none')
+            ax.set_title(hist.title or name)
+            ax.set_xlabel(hist.xtitle)
+            ax.set_ylabel(hist.ytitle)
+            rebuild = is2D
+            if( pages is not None ):
+                pages.savefig(fig)
+            else:
+                written.append('%s%s.%s' % (filepath, name, filetype))
+                fig.savefig(written[-1])
+    finally:
+        if( pages is not None ):
+            pages.close()
+            written.append(path)
+    return written
+
+
+_renderers = {'root': _RenderROOT, 'matplotlib': _RenderMatplotlib}
+
+
+def _RenderJob(job):
+    """Run one worker's share of Plotter.PlotsToPDF."""
+    renderer, plots, filepath, filetype, multipage = job
+    return _renderers[renderer](plots, filepath, filetype, multipage)
+
+
+class Plotter(object):
+    """Histogram plotter object. With backend='root' the plots are ROOT
+    histograms filled through PyROOT. With backend='numpy' they are
+    histogram.Hist1D/Hist2D objects filled from whole arrays, and ROOT is
+    only needed to write a .root file or draw the plots. Neither ROOT nor
+    the numpy backend is imported until a plot or ntuple needs it."""
+
+
+    def __init__(self, title='', filename=None, filepath='plots/',
+                 backend='root'):
+
+        if( filepath.endswith('/') ):
+            self.filepath = filepath
+        else:
+            self.filepath = filepath + '/'
+        try:
+            os.mkdir(filepath)
+        except OSError:
+            #The directory already exists
+            pass
+        if( backend not in ('root', 'numpy') ):
+            raise RuntimeError('Unknown backend %s.' % backend)
+        self.backend = backend
+        self.title = title
+        self.filename = filename
+        if( filename is not None and backend == 'root' ):
+            self.tfile = _ROOT().TFile(self.filepath+filename, 'RECREATE',
+                                       title)
+        else:
+            self.tfile = None
+        self.plots1D = {}
+        self.plots2D = {}
+        return
+
+
+    def SetPalette(self, optstat=1111111):
+        """Sets default plot settings."""
+        ROOT = _ROOT()
+        gROOT = ROOT.gROOT
+        gStyle = ROOT.gStyle
+        gROOT.Reset()
+        gROOT.SetStyle('Plain')
+        gStyle.SetOptStat(optstat)
+        gStyle.SetPalette(1)
+        gStyle.SetLineColor(4)
+        return
+
+
+    def BookNTuple(self, title, vals):
+        """Book an ntuple with the columns named in vals. With the numpy
+        backend it is an ntuple.ColumnWriter directory under filepath."""
+        if( self.backend == 'numpy' ):
+            from .ntuple import ColumnWriter
+            self.ntuple = ColumnWriter(self.filepath+title, list(vals))
+            return
+        self.ntuple = _ROOT().TNtuple(title, title, ':'.join(vals))
+        return
+
+
+    def FillNTuple(self, values):
+        """Fill the ntuple with one row."""
+        if( self.backend == 'numpy' ):
+            self.ntuple.Fill(values)
+        else:
+            self.ntuple.Fill(*values)
+        return
+
+
+    def FillNTupleBlock(self, columns):
+        """Fill the ntuple with a block given as a dict of column arrays."""
+        if( self.backend == 'numpy' ):
+            self.ntuple.Append(columns)
+            return
+        names = [b.GetName() for b in self.ntuple.GetListOfBranches()]
+        for row in zip(*[columns[name] for name in names]):
+            self.ntuple.Fill(*row)
+        return
+    
+
+    def AddPlot1D(self, name, nbins, minimum, maximum, title='', xtitle='',
+                  ytitle=''):
+        """Book a 1D histogram."""
+        if( self.backend == 'numpy' ):
+            from .histogram import Hist1D
+            self.plots1D[name] = Hist1D(name, nbins, minimum, maximum, title,
+                                        xtitle, ytitle)
+            return
+        hist = _ROOT().TH1F(name, title, nbins, minimum, maximum)
+        hist.Sumw2()
+        hist.SetXTitle(xtitle)
+        hist.SetYTitle(ytitle)
+        self.plots1D[name] = hist
+
+    
+    def AddPlot2D(self, name, nxbins, xmin, xmax, nybins, ymin, ymax, title='',
+                  xtitle='', ytitle=''):
+        """Book a 2D histogram."""
+        if( self.backend == 'numpy' ):
+            from .histogram import Hist2D
+            self.plots2D[name] = Hist2D(name, nxbins, xmin, xmax, nybins,
+                                        ymin, ymax, title, xtitle, ytitle)
+            return
+        hist = _ROOT().TH2F(name, title, nxbins, xmin, xmax, nybins, ymin,
+                            ymax)
+        hist.Sumw2()
+        hist.SetXTitle(xtitle)
+        hist.SetYTitle(ytitle)
+        self.plots2D[name] = hist
+        return
+    
+
+    def FillHist1D(self, name, val, weight=None):
+        """Fill a 1D histogram with a value or an array of values."""
+        hist = self.plots1D[name]
+        if( self.backend == 'numpy' ):
+            hist.Fill(val, weight)
+        elif( hasattr(val, '__len__') ):
+            n = len(val)
+            if( weight is None ):
+                weight = [1.] * n
+            elif( not hasattr(weight, '__len__') ):
+                weight = [weight] * n
+            hist.FillN(n, _array('d', val), _array('d', weight))
+        elif( weight is None ):
+            hist.Fill(val)
+        else:
+            hist.Fill(val, weight)
+        return
+
+
+    def FillHist2D(self, name, xval, yval, weight=None):
+        """Fill a 2D histogram with values or arrays of values."""
+        hist = self.plots2D[name]
+        if( self.backend == 'numpy' ):
+            hist.Fill(xval, yval, weight)
+        elif( hasattr(xval, '__len__') ):
+            n = len(xval)
+            if( weight is None ):
+                weight = [1.] * n
+            elif( not hasattr(weight, '__len__') ):
+                weight = [weight] * n
+            hist.FillN(n, _array('d', xval), _array('d', yval),
+                       _array('d', weight))
+        elif( weight is None ):
+            hist.Fill(xval, yval)
+        else:
+            hist.Fill(xval, yval, weight)
+        return
+
+
+    def Merge(self, other):
+        """Add the numpy-backend plots of another Plotter with the same
+        booked plots, e.g. from a parallel worker."""
+        for name, hist in other.plots1D.items():
+            self.plots1D[name].Merge(hist)
+        for name, hist in other.plots2D.items():
+            self.plots2D[name].Merge(hist)
+        return self
+
+
+    def NormalizePlots(self):
+        """Normalize plots to 1."""
+        for plots in (self.plots1D, self.plots2D):
+            for name,hist in plots.items():
+                try:
+                    hist.Scale(1/hist.Integral())
+                except ZeroDivisionError:
+                    pass
+        return
+    
+
+    def PlotsToPDF(self, filetype='pdf', multipage=False, renderer='root',
+                   processes=1, filename=None):
+        """Render every booked 1D and 2D plot, one canvas or figure reused
+        for all of them. Each plot goes to its own <filepath><name>.<filetype>
+        file, or with multipage=True (pdf or ps) to the pages of a single
+        <filepath><filename>.<filetype>, named after the title by default.
+        renderer is 'root' or 'matplotlib', which needs the numpy backend
+        but not ROOT. With processes > 1 the plots of the numpy backend are
+        split between worker processes, which needs one file per plot.
+        Return the written paths."""
+        if( renderer not in _renderers ):
+            raise RuntimeError('Unknown renderer %s.' % renderer)
+        if( renderer != 'root' and self.backend != 'numpy' ):
+            raise RuntimeError('The %s renderer needs the numpy backend.' %
+                               renderer)
+        if( multipage and filetype not in ('pdf', 'ps') or
+            multipage and renderer == 'matplotlib' and filetype != 'pdf' ):
+            raise RuntimeError('Multi-page output needs pdf (or ps with '
+                               'ROOT).')
+        if( processes > 1 and self.backend != 'numpy' ):
+            raise RuntimeError('Parallel rendering needs the numpy backend.')
+        if( processes > 1 and multipage ):
+            raise RuntimeError('Multi-page output can\'t be rendered in '
+                               'parallel.')
+        plots = ([(name, hist, False) for name, hist in
+                  sorted(self.plots1D.items())] +
+                 [(name, hist, True) for name, hist in
+                  sorted(self.plots2D.items())])
+        if( filename is None ):
+            filename = self.title or 'plots'
+        processes = max(1, min(processes, len(plots)))
+        if( processes == 1 ):
+            return _renderers[renderer](plots, self.filepath, filetype,
+                                        multipage and filename)
+        import multiprocessing
+        jobs = []
+        for i in range(processes):
+            jobs.append((renderer, plots[i::processes], self.filepath,
+                         filetype, False))
+        pool = multiprocessing.Pool(processes)
+        try:
+            written = pool.map(_RenderJob, jobs)
+        finally:
+            pool.close()
+            pool.join()
+        return [path for paths in written for path in paths]
+
+
+    def SaveFile(self):
+        """Save plots to file. With the numpy backend a filename ending in
+        .npz is written with numpy, anything else as a ROOT file."""
+        if( self.backend == 'numpy' and self.filename is not None ):
+            if( self.filename.endswith('.npz') ):
+                self._SaveNPZ(self.filepath+self.filename)
+                return
+            if( not self.tfile ):
+                self.tfile = _ROOT().TFile(self.filepath+self.filename,
+                                           'RECREATE', self.title)
+            self.tfile.cd()
+            for plots in (self.plots1D, self.plots2D):
+                for name,hist in plots.items():
+                    hist.ToROOT().Write()
+            return
+        if( self.tfile ):
+            self.tfile.Write()
+        return
+
+
+    def _SaveNPZ(self, path):
+        """Write the numpy-backend plots to a .npz file."""
+        import numpy as np
+        arrays = {}
+        for plots in (self.plots1D, self.plots2D):
+            for name,hist in plots.items():
+                arrays[name + '.sumw'] = hist.sumw
+                arrays[name + '.sumw2'] = hist.sumw2
+        np.savez(path, **arrays)
+        return
+
+    def CloseFile(self):
+        if( self.backend == 'numpy' and hasattr(self, 'ntuple') ):
+            self.ntuple.Close()
+        if( self.tfile ):
+            self.tfile.Close()
+            self.tfile=None
+        return
@@ -0,0 +1,80 @@
+from __future__ import division, print_function
+import numpy as _np
+from .distributions import getStream
+from .angular import Isotropic
+
+
+class BiasedExponential(object):
+    """Importance sampler for the randExp distribution, minimum + Exp(lambd).
+    Values are drawn from minimum + Exp(biasLambd), with biasLambd > lambd
+    to populate the high tail, and returned with the weights
+    p_target / p_bias so weighted sums estimate the target distribution.
+    It can be passed as the pt sampler of stream.generateChunks."""
+
+
+    def __init__(self, lambd=250, minimum=50, biasLambd=None):
+        self.lambd = lambd
+        self.minimum = minimum
+        self.biasLambd = 2 * lambd if biasLambd is None else biasLambd
+        return
+
+
+    def Sample(self, size=None, rng=None):
+        """Return the values and their weights."""
+        t = getStream(rng).exponential(self.biasLambd, size)
+        w = (self.biasLambd / self.lambd) * _np.exp(
+            t * (1. / self.biasLambd - 1. / self.lambd))
+        return t + self.minimum, w
+
+
+    def __call__(self, n, rng):
+        return self.Sample(n, rng)
+
+
+class BiasedCosTheta(object):
+    """Importance sampler for cos(theta) of a two-body decay, whose target is
+    an angular.AngularDistribution (isotropic by default). A fraction of the
+    values is drawn from exponentials of the given scale in 1 - |cos(theta)|
+    at cos(theta) = +-1, pushing daughters along the beam axis; for a bounded
+    target pdf the weights are bounded by 2 max(pdf) / (1 - fraction). It
+    can be passed as the cosTheta sampler of stream.generateChunks or its
+    Sample result given to decayBatch."""
+
+
+    def __init__(self, fraction=0.5, scale=0.05, target=None):
+        assert (0 <= fraction < 1), 'fraction must be in [0, 1)'
+        self.fraction = fraction
+        self.scale = scale
+        self.target = Isotropic() if target is None else target
+        self._norm = 1. - _np.exp(-1. / scale)
+        return
+
+
+    def PDF(self, c):
+        """Return the biased density of cos(theta)."""
+        t = 1. - _np.abs(c)
+        peak = 0.5 * _np.exp(-t / self.scale) / (self.scale * self._norm)
+        return 0.5 * (1. - self.fraction) + self.fraction * peak
+
+
+    def Sample(self, size=None, rng=None):
+        """Return the cos(theta) values and their weights."""
+        rng = getStream(rng)
+        u = rng.random(size)
+        c = 2 * rng.random(size) - 1
+        peaked = rng.random(size) < self.fraction
+        t = 1. + self.scale * _np.log(1. - u * self._norm)
+        t = _np.where(rng.random(size) < 0.5, t, -t)
+        c = _np.where(peaked, t, c)
+        return c, self.target.PDF(c) / self.PDF(c)
+
+
+    def __call__(self, n, rng):
+        return self.Sample(n, rng)
+
+
+def effectiveEntries(weights):
+    """Return the effective number of events, (sum w)^2 / sum w^2."""
+    w = _np.asarray(weights, dtype=_np.float64)
+    w2 = (w * w).sum()
+    return w.sum()**2 / w2 if w2 > 0 else 0.
@@ -0,0 +1,227 @@
+from __future__ import division, print_function
+import json
+import os
+import re
+import numpy as _np
+from .profiling import getProfiler
+
+FORMAT = 'decaysim-columns'
+VERSION = 1
+COMPONENTS = ('px', 'py', 'pz', 'e')
+_validName = re.compile(r'^[A-Za-z0-9_.+-]+$')
+
+
+def eventColumns(chunk):
+    """Flatten an EventChunk into named columns: <particle>_px, _py, _pz,
+    _e for every particle, then isGood, veto, weight and the derived
+    columns."""
+    columns = {}
+    for name in sorted(chunk.particles):
+        data = chunk.particles[name].Data()
+        for i, comp in enumerate(COMPONENTS):
+            columns['%s_%s' % (name, comp)] = data[i]
+    columns['isGood'] = chunk.isGood
+    columns['veto'] = chunk.veto
+    columns['weight'] = chunk.weights
+    columns.update(chunk.columns)
+    return columns
+
+
+class ColumnWriter(object):
+    """Writes named columns in blocks to a directory holding one raw
+    little-endian file per column and a header.json describing them. The
+    files can be memory-mapped back with ColumnReader. Columns are given as
+    a list of names (float64) or of (name, dtype) pairs, and metadata is any
+    JSON-serializable dict stored in the header."""
+
+
+    def __init__(self, path, columns, metadata=None, blockSize=100000,
+                 append=False):
+        self.path = path
+        self._blockSize = blockSize
+        self._rows = []
+        if( append and os.path.exists(os.path.join(path, 'header.json')) ):
+            header = readHeader(path)
+            self.columns = [(c['name'], _np.dtype(c['dtype']))
+                            for c in header['columns']]
+            self.nrows = header['nrows']
+            self.metadata = header['metadata']
+            mode = 'ab'
+        else:
+            self.columns = []
+            for c in columns:
+                if( isinstance(c, tuple) ):
+                    name, dtype = c
+                else:
+                    name, dtype = c, _np.float64
+                if( not _validName.match(name) ):
+                    raise RuntimeError('Invalid column name %s.' % name)
+                self.columns.append((name, _np.dtype(dtype).newbyteorder('<')))
+            self.nrows = 0
+            self.metadata = metadata or {}
+            mode = 'wb'
+            try:
+                os.makedirs(path)
+            except OSError:
+                #The directory already exists
+                pass
+        self._files = [open(os.path.join(path, name + '.bin'), mode)
+                       for name, dtype in self.columns]
+        self._WriteHeader()
+        return
+
+
+    def _WriteHeader(self):
+        header = {'format': FORMAT, 'version': VERSION, 'nrows': self.nrows,
+                  'columns': [{'name': name, 'dtype': dtype.str}
+                              for name, dtype in self.columns],
+                  'metadata': self.metadata}
+        tmp = os.path.join(self.path, 'header.json.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(header, f, indent=1, sort_keys=True)
+        os.rename(tmp, os.path.join(self.path, 'header.json'))
+        return
+
+
+    def Append(self, columns):
+        """Append a block given as a dict of equal-length arrays holding at
+        least every booked column."""
+        self._FlushRows()
+        n = None
+        for (name, dtype), f in zip(self.columns, self._files):
+            block = _np.ascontiguousarray(columns[name], dtype=dtype)
+            if( n is None ):
+                n = len(block)
+            elif( len(block) != n ):
+                raise RuntimeError('Column %s has length %d, expected %d.'
+                                   % (name, len(block), n))
+            f.write(block.tobytes())
+        self.nrows += n or 0
+        return
+
+
+    def Fill(self, values):
+        """Append one row, buffered until blockSize rows are collected."""
+        self._rows.append(tuple(values))
+        if( len(self._rows) >= self._blockSize ):
+            self._FlushRows()
+        return
+
+
+    def _FlushRows(self):
+        if( not self._rows ):
+            return
+        rows = self._rows
+        self._rows = []
+        cols = list(zip(*rows))
+        self.Append(dict((name, cols[i]) for i, (name, dtype) in
+                         enumerate(self.columns)))
+        return
+
+
+    def Stage(self, chunks, columns=eventColumns, profiler=None):
+        """Stream stage appending columns(chunk) for every EventChunk,
+        timed as the 'output' stage by a profiler."""
+        profiler = getProfiler(profiler)
+        for chunk in chunks:
+            with profiler.Stage('output', len(chunk)):
+                self.Append(columns(chunk))
+            yield chunk
+
+
+    def Flush(self):
+        """Write out buffered rows and update the header."""
+        self._FlushRows()
+        for f in self._files:
+            f.flush()
+        self._WriteHeader()
+        return
+
+
+    def Close(self):
+        if( self._files ):
+            self.Flush()
+            for f in self._files:
+                f.close()
+            self._files = []
+        return
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *args):
+        self.Close()
+
+
+def readHeader(path):
+    """Return the parsed header.json of a column directory."""
+    with open(os.path.join(path, 'header.json')) as f:
+        header = json.load(f)
+    if( header.get('format') != FORMAT ):
+        raise RuntimeError('%s is not a column directory.' % path)
+    return header
+
+
+class ColumnReader(object):
+    """Read-only access to a directory written by ColumnWriter. Columns are
+    opened with numpy.memmap on first access, so only the pages of the
+    columns actually read are touched."""
+
+
+    def __init__(self, path):
+        self.path = path
+        header = readHeader(path)
+        self.nrows = header['nrows']
+        self.metadata = header['metadata']
+        self.dtypes = dict((c['name'], _np.dtype(c['dtype']))
+                           for c in header['columns'])
+        self.names = [c['name'] for c in header['columns']]
+        self._maps = {}
+        return
+
+
+    def __len__(self):
+        return self.nrows
+
+
+    def __getitem__(self, name):
+        """Return a column as a read-only memory-mapped array."""
+        if( name not in self._maps ):
+            if( self.nrows == 0 ):
+                self._maps[name] = _np.zeros(0, dtype=self.dtypes[name])
+            else:
+                self._maps[name] = _np.memmap(
+                    os.path.join(self.path, name + '.bin'),
+                    dtype=self.dtypes[name], mode='r', shape=(self.nrows,))
+        return self._maps[name]
+
+
+    def Chunks(self, names=None, chunkSize=1000000):
+        """Yield dicts of column slices of at most chunkSize rows."""
+        if( names is None ):
+            names = self.names
+        for start in range(0, self.nrows, chunkSize):
+            yield dict((name, self[name][start:start + chunkSize])
+                       for name in names)
+
+
+def writeNPZ(path, columns, metadata=None):
+    """Write a dict of columns to a single .npz file."""
+    arrays = dict(columns)
+    if( metadata is not None ):
+        arrays['__metadata__'] = _np.array(json.dumps(metadata))
+    _np.savez(path, **arrays)
+    return
+
+
+def readNPZ(path):
+    """Read a file written by writeNPZ. Return the columns and metadata."""
+    with _np.load(path) as f:
+        columns = dict((name, f[name]) for name in f.files
+                       if name != '__metadata__')
+        metadata = {}
+        if( '__metadata__' in f.files ):
+            metadata = json.loads(str(f['__metadata__']))
+    return columns, metadata
@@ -0,0 +1,371 @@
+from __future__ import division, print_function
+import numpy as _np
+from . import utils
+
+
+class Moments(object):
+    """Weighted running count, mean, variance, minimum and maximum. Batches
+    are folded in with the pairwise form of Welford's update (Chan et al.),
+    so memory is constant and two Moments merge exactly."""
+
+
+    def __init__(self):
+        self.entries = 0
+        self.sumw = 0.
+        self.sumw2 = 0.
+        self.mean = 0.
+        self.m2 = 0.
+        self.min = _np.inf
+        self.max = -_np.inf
+        return
+
+
+    def _Combine(self, entries, sumw, sumw2, mean, m2, minimum, maximum):
+        if( sumw <= 0 ):
+            return self
+        total = self.sumw + sumw
+        delta = mean - self.mean
+        self.mean += delta * sumw / total
+        self.m2 += m2 + delta * delta * self.sumw * sumw / total
+        self.sumw = total
+        self.sumw2 += sumw2
+        self.entries += entries
+        self.min = min(self.min, minimum)
+        self.max = max(self.max, maximum)
+        return self
+
+
+    def Update(self, values, weights=None):
+        """Add a batch of values with optional weights."""
+        values = _np.asarray(values, dtype=_np.float64).ravel()
+        if( values.size == 0 ):
+            return self
+        if( weights is None ):
+            sumw = float(values.size)
+            sumw2 = sumw
+            mean = values.mean()
+            m2 = ((values - mean)**2).sum()
+        else:
+            weights = _np.asarray(weights, dtype=_np.float64).ravel()
+            sumw = weights.sum()
+            sumw2 = (weights * weights).sum()
+            if( sumw <= 0 ):
+                return self
+            mean = (weights * values).sum() / sumw
+            m2 = (weights * (values - mean)**2).sum()
+        return self._Combine(values.size, sumw, sumw2, mean, m2,
+                             values.min(), values.max())
+
+
+    def Merge(self, other):
+        """Add the values seen by another Moments, e.g. from a shard."""
+        return self._Combine(other.entries, other.sumw, other.sumw2,
+                             other.mean, other.m2, other.min, other.max)
+
+
+    def Variance(self):
+        """Return the (biased, weighted) variance."""
+        return self.m2 / self.sumw if self.sumw > 0 else 0.
+
+
+    def Std(self):
+        return _np.sqrt(self.Variance())
+
+
+    def MeanError(self):
+        """Return the error of the mean, using the effective entries."""
+        if( self.sumw2 <= 0 ):
+            return 0.
+        return _np.sqrt(self.Variance() * self.sumw2) / self.sumw
+
+
+class Covariance(object):
+    """Weighted running means and co-moment matrix of k observables, updated
+    from (k, N) batches and mergeable like Moments."""
+
+
+    def __init__(self, k):
+        self.k = k
+        self.sumw = 0.
+        self.mean = _np.zeros(k)
+        self.c = _np.zeros((k, k))
+        return
+
+
+    def _Combine(self, sumw, mean, c):
+        if( sumw <= 0 ):
+            return self
+        total = self.sumw + sumw
+        delta = mean - self.mean
+        self.mean += delta * sumw / total
+        self.c += c + _np.outer(delta, delta) * self.sumw * sumw / total
+        self.sumw = total
+        return self
+
+
+    def Update(self, columns, weights=None):
+        """Add a batch given as a (k, N) array or a list of k arrays."""
+        x = _np.asarray(columns, dtype=_np.float64).reshape(self.k, -1)
+        if( x.shape[1] == 0 ):
+            return self
+        if( weights is None ):
+            weights = _np.ones(x.shape[1])
+        weights = _np.asarray(weights, dtype=_np.float64)
+        sumw = weights.sum()
+        if( sumw <= 0 ):
+            return self
+        mean = x.dot(weights) / sumw
+        dx = x - mean[:, None]
+        return self._Combine(sumw, mean, (dx * weights).dot(dx.T))
+
+
+    def Merge(self, other):
+        return self._Combine(other.sumw, other.mean, other.c)
+
+
+    def Matrix(self):
+        """Return the (biased, weighted) covariance matrix."""
+        return self.c / self.sumw if self.sumw > 0 else _np.zeros_like(self.c)
+
+
+    def Correlation(self):
+        """Return the correlation matrix, 0 for constant observables."""
+        cov = self.Matrix()
+        std = _np.sqrt(_np.diag(cov))
+        norm = _np.outer(std, std)
+        with _np.errstate(divide='ignore', invalid='ignore'):
+            return _np.where(norm > 0, cov / norm, 0.)
+
+
+class _Store(object):
+    """Dense weighted counts for consecutive bucket indices starting at
+    offset, collapsing the lowest buckets beyond maxBins."""
+
+
+    def __init__(self, maxBins):
+        self.maxBins = maxBins
+        self.offset = 0
+        self.counts = _np.zeros(0)
+        return
+
+
+    def Add(self, index, weights):
+        if( index.size == 0 ):
+            return
+        lo = int(index.min())
+        hi = int(index.max())
+        if( self.counts.size ):
+            lo = min(lo, self.offset)
+            hi = max(hi, self.offset + self.counts.size - 1)
+        lo = max(lo, hi - self.maxBins + 1)
+        counts = _np.zeros(hi - lo + 1)
+        if( self.counts.size ):
+            old = _np.clip(_np.arange(self.offset, self.offset +
+                                      self.counts.size), lo, hi) - lo
+            _np.add.at(counts, old, self.counts)
+        counts += _np.bincount(_np.clip(index, lo, hi) - lo, weights,
+                               minlength=counts.size)
+        self.offset = lo
+        self.counts = counts
+        return
+
+
+    def Merge(self, other):
+        if( other.counts.size ):
+            self.Add(_np.arange(other.offset, other.offset +
+                                other.counts.size), other.counts)
+        return
+
+
+class QuantileSketch(object):
+    """Mergeable quantile sketch with relative accuracy alpha (DDSketch):
+    values fall into logarithmic buckets of ratio (1 + alpha)/(1 - alpha),
+    kept separately for positive and negative values, so any quantile is
+    returned within a relative error alpha of a true sample value. Memory
+    is bounded by maxBins buckets per sign; beyond that the buckets nearest
+    zero are collapsed, which only affects quantiles there."""
+
+
+    def __init__(self, alpha=0.005, maxBins=2048):
+        self.alpha = alpha
+        self._gamma = (1. + alpha) / (1. - alpha)
+        self._logGamma = _np.log(self._gamma)
+        self._positive = _Store(maxBins)
+        self._negative = _Store(maxBins)
+        self.zero = 0.
+        self.sumw = 0.
+        return
+
+
+    def _Index(self, x):
+        return _np.ceil(_np.log(x) / self._logGamma).astype(_np.int64)
+
+
+    def Update(self, values, weights=None):
+        """Add a batch of values with optional weights."""
+        values = _np.asarray(values, dtype=_np.float64).ravel()
+        if( weights is None ):
+            weights = _np.ones(values.size)
+        weights = _np.asarray(weights, dtype=_np.float64).ravel()
+        #Values below this are treated as zero.
+        tiny = 1e-300
+        pos = values > tiny
+        neg = values < -tiny
+        self._positive.Add(self._Index(values[pos]), weights[pos])
+        self._negative.Add(self._Index(-values[neg]), weights[neg])
+        self.zero += weights[~(pos | neg)].sum()
+        self.sumw += weights.sum()
+        return self
+
+
+    def Merge(self, other):
+        """Add the values seen by another sketch with the same alpha."""
+        if( other.alpha != self.alpha ):
+            raise RuntimeError('Can\'t merge sketches of different accuracy.')
+        self._positive.Merge(other._positive)
+        self._negative.Merge(other._negative)
+        self.zero += other.zero
+        self.sumw += other.sumw
+        return self
+
+
+    def Quantile(self, q):
+        """Return the q-quantile(s), q in [0, 1]."""
+        q = _np.asarray(q, dtype=_np.float64)
+        if( self.sumw <= 0 ):
+            return _np.full(q.shape, _np.nan)
+        neg = self._negative
+        pos = self._positive
+        #All buckets in increasing order of value.
+        values = _np.concatenate([
+            -self._Value(neg.offset + _np.arange(neg.counts.size))[::-1],
+            [0.], self._Value(pos.offset + _np.arange(pos.counts.size))])
+        counts = _np.concatenate([neg.counts[::-1], [self.zero], pos.counts])
+        cumulative = _np.cumsum(counts)
+        #The first bucket reaching q of the total, skipping empty ones.
+        target = _np.maximum(q * self.sumw, 1e-12 * self.sumw)
+        i = _np.searchsorted(cumulative, target, side='left')
+        return values[_np.clip(i, 0, values.size - 1)]
+
+
+    def _Value(self, index):
+        return 2. * self._gamma**index / (self._gamma + 1.)
+
+
+    def Median(self):
+        return float(self.Quantile(0.5))
+
+
+class OnlineStats(object):
+    """Streaming summary of per-event observables: Moments and a
+    QuantileSketch for each and the Covariance of all of them, in memory
+    independent of the number of events. observables maps a name to
+    f(chunk) returning one value per event, e.g. defaultObservables().
+    It is a sink for stream.consume, counting the accepted events with
+    their weights, and merges across parallel shards."""
+
+
+    def __init__(self, observables, alpha=0.005, acceptedOnly=True):
+        self.names = list(observables)
+        self._funcs = [observables[name] for name in self.names]
+        self.acceptedOnly = acceptedOnly
+        self.moments = dict((name, Moments()) for name in self.names)
+        self.sketches = dict((name, QuantileSketch(alpha))
+                             for name in self.names)
+        self.covariance = Covariance(len(self.names))
+        return
+
+
+    def Update(self, chunk):
+        """Add the events of an EventChunk."""
+        mask = chunk.Accepted() if self.acceptedOnly else Ellipsis
+        weights = chunk.weights[mask]
+        columns = [_np.asarray(f(chunk), dtype=_np.float64)[mask]
+                   for f in self._funcs]
+        for name, values in zip(self.names, columns):
+            self.moments[name].Update(values, weights)
+            self.sketches[name].Update(values, weights)
+        self.covariance.Update(columns, weights)
+        return self
+
+
+    __call__ = Update
+
+
+    def Merge(self, other):
+        for name in self.names:
+            self.moments[name].Merge(other.moments[name])
+            self.sketches[name].Merge(other.sketches[name])
+        self.covariance.Merge(other.covariance)
+        return self
+
+
+    def Summary(self, quantiles=(0.05, 0.25, 0.5, 0.75, 0.95)):
+        """Return the results as a dict of plain types."""
+        result = {'observables': {}, 'names': list(self.names),
+                  'correlation': self.covariance.Correlation().tolist()}
+        for name in self.names:
+            m = self.moments[name]
+            q = self.sketches[name].Quantile(quantiles)
+            result['observables'][name] = {
+                'entries': m.entries, 'sumw': m.sumw, 'mean': m.mean,
+                'meanError': m.MeanError(), 'std': m.Std(), 'min': m.min,
+                'max': m.max,
+                'quantiles': dict(('%g' % p, float(v))
+                                  for p, v in zip(quantiles, q))}
+        return result
+
+
+    def Print(self):
+        print('%-14s %10s %12s %12s %12s %12s %12s' % (
+            'observable', 'entries', 'mean', 'std', 'q05', 'median', 'q95'))
+        for name in self.names:
+            m = self.moments[name]
+            q05, q50, q95 = self.sketches[name].Quantile((0.05, 0.5, 0.95))
+            print('%-14s %10d %12.5g %12.5g %12.5g %12.5g %12.5g' % (
+                name, m.entries, m.mean, m.Std(), q05, q50, q95))
+        return
+
+
+def defaultObservables(names=('d1', 'd2')):
+    """Return the usual observables of a two-body decay: pT and eta of each
+    named daughter, the cosine of the angle between the first two and their
+    invariant mass."""
+    a, b = names[:2]
+    observables = {}
+    for name in names:
+        observables[name + '.pt'] = _Method(name, 'Pt')
+        observables[name + '.eta'] = _Method(name, 'Eta')
+    observables['cosTheta'] = _Pair(utils.CosThetaArray, a, b)
+    observables['mass'] = _Pair(utils.InvariantMass, a, b)
+    return observables
+
+
+class _Method(object):
+    """Observable calling a method of one particle batch. Unlike a lambda
+    it can be pickled for parallel shards."""
+
+
+    def __init__(self, name, method):
+        self.name = name
+        self.method = method
+        return
+
+
+    def __call__(self, chunk):
+        return getattr(chunk.particles[self.name], self.method)()
+
+
+class _Pair(object):
+    """Observable computed by func from two particle batches."""
+
+
+    def __init__(self, func, a, b):
+        self.func = func
+        self.a = a
+        self.b = b
+        return
+
+
+    def __call__(self, chunk):
+        return self.func(chunk.particles[self.a], chunk.particles[self.b])
@@ -0,0 +1,106 @@
+from __future__ import division, print_function
+from timeit import default_timer as _timer
+import multiprocessing as _mp
+import os
+import numpy as _np
+from .distributions import RandomStream
+
+
+def shardSizes(nEvents, nShards):
+    """Split nEvents into nShards nearly equal parts, the first shards
+    taking the remainder."""
+    base, extra = divmod(nEvents, nShards)
+    return [base + (1 if i < extra else 0) for i in range(nShards)]
+
+
+def mergeResults(results):
+    """Merge shard results in shard order. Arrays and lists are
+    concatenated, dicts and tuples are merged entry by entry, objects with
+    a Merge() method (e.g. histograms) are merged into the first one and
+    numbers are summed."""
+    first = results[0]
+    if( isinstance(first, dict) ):
+        return dict((key, mergeResults([r[key] for r in results]))
+                    for key in first)
+    if( isinstance(first, tuple) ):
+        return tuple(mergeResults(list(parts)) for parts in zip(*results))
+    if( isinstance(first, _np.ndarray) ):
+        return _np.concatenate(results)
+    if( isinstance(first, list) ):
+        return [item for r in results for item in r]
+    if( hasattr(first, 'Merge') ):
+        for r in results[1:]:
+            first.Merge(r)
+        return first
+    return sum(results[1:], first)
+
+
+def _RunShard(job):
+    """Run one shard in a worker and time it."""
+    task, index, nEvents, rng = job
+    start = _timer()
+    result = task(nEvents, rng)
+    seconds = _timer() - start
+    report = {'shard': index, 'pid': os.getpid(), 'events': nEvents,
+              'seconds': seconds,
+              'eventsPerSec': nEvents / seconds if seconds > 0 else 0.}
+    return result, report
+
+
+#Default shard count, fixed so a seed gives the same sample on any machine.
+NSHARDS = 64
+
+
+def runParallel(task, nEvents, nShards=NSHARDS, seed=None, processes=None):
+    """Generate nEvents on a process pool. task(n, rng) must be picklable
+    (a module-level function or a functools.partial of one) and return the
+    result for n events drawn from rng. Each shard gets its own child of
+    RandomStream(seed), and the shard results are merged in shard order,
+    so the output depends only on seed and nShards, never on processes or
+    the number of cores. Return the merged result and the list of
+    per-shard reports."""
+    if( processes is None ):
+        processes = _mp.cpu_count()
+    if( nShards is None ):
+        nShards = NSHARDS
+    streams = RandomStream(seed).Spawn(nShards)
+    jobs = [(task, i, n, rng) for i, (n, rng) in
+            enumerate(zip(shardSizes(nEvents, nShards), streams))]
+    if( processes == 1 ):
+        out = [_RunShard(job) for job in jobs]
+    else:
+        pool = _mp.Pool(processes)
+        try:
+            out = pool.map(_RunShard, jobs, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+    results = [r for r, report in out]
+    reports = [report for r, report in out]
+    return mergeResults(results), reports
+
+
+def workerThroughput(reports):
+    """Sum the shard reports per worker process. Return a dict of
+    pid -> {'shards', 'events', 'seconds', 'eventsPerSec'}."""
+    workers = {}
+    for report in reports:
+        w = workers.setdefault(report['pid'], {'shards': 0, 'events': 0,
+                                               'seconds': 0.})
+        w['shards'] += 1
+        w['events'] += report['events']
+        w['seconds'] += report['seconds']
+    for w in workers.values():
+        w['eventsPerSec'] = w['events'] / w['seconds'] if w['seconds'] else 0.
+    return workers
+
+
+def printReport(reports):
+    """Print the per-worker throughput."""
+    workers = workerThroughput(reports)
+    for pid in sorted(workers):
+        w = workers[pid]
+        print('worker %6d: %3d shards %12d events %9.3f s %12.0f events/s' %
+              (pid, w['shards'], w['events'], w['seconds'],
+               w['eventsPerSec']))
+    return
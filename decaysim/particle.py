@@ -0,0 +1,240 @@
+from __future__ import division, print_function
+from math import sqrt as _sqrt, pi as _pi, sin as _sin, cos as _cos
+from random import Random as _Random
+from .vector import VecFour, VecThree, LorentzBoost
+
+
+class ScalarStream(_Random):
+    """Standard library generator used by particles without an rng. Its
+    random(size) also returns NumPy arrays, so it can be passed to the
+    samplers of the angular submodule like a RandomStream."""
+
+
+    def random(self, size=None):
+        if( size is None ):
+            return _Random.random(self)
+        import numpy
+        return numpy.array([_Random.random(self) for i in
+                            range(int(numpy.prod(size)))]).reshape(size)
+
+
+_stream = ScalarStream()
+
+
+def seed(s=None):
+    """Reseed the default stream of particles without an rng. Also done by
+    distributions.seed."""
+    _stream.seed(s)
+    return
+
+
+def _Pdk(a, b, c):
+    """Return the momentum of the two-body decay a -> b c."""
+    x = (a - b - c)*(a + b + c)*(a - b + c)*(a + b - c)
+    return _sqrt(max(x, 0.)) / (2 * a)
+
+
+class Particle(object):
+    """Base class for particle objects."""
+
+
+    def __init__(self, m, pt, pz=0, isFinalState=False, epsilon=1e-7,
+                 rng=None):
+
+        self.vec = VecFour()
+        self.m = m
+        self._rng = rng
+        phi = _pi * (2 * self._Random() - 1)
+
+        px = pt * _cos(phi)
+        py = pt * _sin(phi)
+
+        #Initialize the four vector.
+        self.vec.SetPx(px)
+        self.vec.SetPy(py)
+        self.vec.SetPz(pz)
+        self.vec.SetE(_sqrt(self.vec.P2() + m**2))
+
+        self.isGood = True
+        self.veto = False
+        if (m == 0):
+            self.isFinalState = True
+        else:
+            self.isFinalState = isFinalState
+        self._epsilon = epsilon
+        return
+
+
+    def _Random(self, rng=None):
+        """Return a random number on [0, 1) from rng if given, else from
+        the particle's stream, or from the seedable module stream if it has
+        none."""
+        if( rng is None ):
+            rng = self._rng
+        if( rng is None ):
+            return _stream.random()
+        return rng.random()
+
+
+    def P(self):
+        """Return the momentum, cached on the four-vector."""
+        return self.vec.P()
+
+
+    def Pt(self):
+        """Return the transverse momentum, cached on the four-vector."""
+        return self.vec.Pt()
+
+
+    def Eta(self):
+        """Return the pseudorapidity, cached on the four-vector."""
+        return self.vec.Eta()
+
+
+    def Phi(self):
+        """Return phi, cached on the four-vector."""
+        return self.vec.Phi()
+
+
+    def PTCuts(self, cut):
+        if (self.vec.Pt() <= cut):
+            self.veto = True
+        return
+
+    
+    def EtaCuts(self, cut):
+        if (abs(self.vec.Eta()) >= cut):
+            self.veto = True
+        return
+
+    
+class Mother(Particle):
+    """Particle class capable of decays."""
+
+
+    def Decay(self, dM1=0, dM2=0, isFinalState1=False,
+                       isFinalState2=False, rng=None, angular=None):
+        """Decay into daughters in the CM frame. The angles are drawn from
+        rng if given, otherwise from the particle's own stream, and the
+        daughters inherit that stream; the particle's own is left as it is.
+        The decay is isotropic unless angular gives an
+        angular.AngularDistribution for cos(theta)."""
+        assert (not self.isFinalState), 'Can\'t decay final state particles!'
+        assert (self.m != 0), 'Can\'t decay massless particles!'
+        assert (dM1 + dM2 <= self.m), 'Daughter masses violate CoE!'
+                #less than or equal prevent zero-division in rounding errors.
+        if( rng is None ):
+            rng = self._rng
+        phi = _pi * (2 * self._Random(rng) - 1)
+        if( angular is None ):
+            cosTheta = 2 * self._Random(rng) - 1
+        else:
+            cosTheta = float(angular.Sample(
+                None, _stream if rng is None else rng))
+        sinTheta = _sqrt(1 - cosTheta**2)
+
+        e1rest = (self.m**2 + dM1**2 - dM2**2)/(2*self.m)
+        e2rest = self.m - e1rest
+        pDaughters = _sqrt(e1rest**2 - dM1**2)
+
+        px = pDaughters * sinTheta * _cos(phi)
+        py = pDaughters * sinTheta * _sin(phi)
+        pz = pDaughters * cosTheta
+        
+        v1 = VecFour(px, py, pz, e1rest)
+        v2 = VecFour(-px, -py, -pz, e2rest)
+
+        boost = LorentzBoost.FromVector(self.vec)
+        boost.Apply(v1)
+        boost.Apply(v2)
+        
+        if (v1.M2() - dM1**2 > self._epsilon or
+            v2.M2() - dM2**2 > self._epsilon):
+            self.isGood = False
+            
+        return (KnownParticle(v1, dM1, isFinalState1, self._epsilon, rng),
+                KnownParticle(v2, dM2, isFinalState2, self._epsilon, rng))
+
+
+    def _Isotropic(self, p, rng=None):
+        """Return an isotropically oriented momentum of magnitude p."""
+        phi = _pi * (2 * self._Random(rng) - 1)
+        cosTheta = 2 * self._Random(rng) - 1
+        sinTheta = _sqrt(1 - cosTheta**2)
+        return (p * sinTheta * _cos(phi), p * sinTheta * _sin(phi),
+                p * cosTheta)
+
+
+    def DecayN(self, masses, isFinalState=None, rng=None):
+        """Decay into len(masses) daughters uniformly in N-body phase space
+        (GENBOD). isFinalState is a sequence of flags, all False by
+        default. rng is used as in Decay. Return the daughters and the
+        phase-space weight, which is at most 1; see batchdecay.decayBatchN
+        for the batch version."""
+        nd = len(masses)
+        assert (not self.isFinalState), 'Can\'t decay final state particles!'
+        assert (self.m != 0), 'Can\'t decay massless particles!'
+        assert (nd >= 2), 'A decay needs at least two daughters!'
+        assert (sum(masses) <= self.m), 'Daughter masses violate CoE!'
+        if( rng is None ):
+            rng = self._rng
+        if( isFinalState is None ):
+            isFinalState = [False] * nd
+
+        #Invariant masses of the subsystems of the first k + 1 daughters.
+        kinetic = self.m - sum(masses)
+        r = sorted(self._Random(rng) for k in range(nd - 2))
+        subMasses = [masses[0]]
+        for k in range(1, nd - 1):
+            subMasses.append(sum(masses[:k + 1]) + r[k - 1] * kinetic)
+        subMasses.append(self.m)
+
+        weight = 1.
+        emmax = kinetic + masses[0]
+        emmin = 0.
+        pd = []
+        for k in range(nd - 1):
+            pd.append(_Pdk(subMasses[k + 1], subMasses[k], masses[k + 1]))
+            emmin += masses[k]
+            emmax += masses[k + 1]
+            weight *= pd[k] / _Pdk(emmax, emmin, masses[k + 1])
+
+        px, py, pz = self._Isotropic(pd[0], rng)
+        vecs = [VecFour(px, py, pz, _sqrt(pd[0]**2 + masses[0]**2)),
+                VecFour(-px, -py, -pz, _sqrt(pd[0]**2 + masses[1]**2))]
+        for k in range(1, nd - 1):
+            px, py, pz = self._Isotropic(pd[k], rng)
+            vecs.append(VecFour(-px, -py, -pz,
+                                _sqrt(pd[k]**2 + masses[k + 1]**2)))
+            e = _sqrt(pd[k]**2 + subMasses[k]**2)
+            boost = LorentzBoost(VecThree(px / e, py / e, pz / e))
+            for v in vecs[:-1]:
+                boost.Apply(v)
+
+        boost = LorentzBoost.FromVector(self.vec)
+        daughters = []
+        for v, dM, final in zip(vecs, masses, isFinalState):
+            boost.Apply(v)
+            if (v.M2() - dM**2 > self._epsilon):
+                self.isGood = False
+            daughters.append(KnownParticle(v, dM, final, self._epsilon,
+                                           rng))
+        return tuple(daughters), weight
+        
+    
+    
+
+class KnownParticle(Mother):
+    """Class for a particle with known four-vector."""
+    def __init__(self, vec, m, isFinalState, epsilon=1e-7, rng=None):
+        self.vec = vec
+        self.m = m
+        self._rng = rng
+        if(m == 0):
+            self.isFinalState = True
+        else:    
+            self.isFinalState = isFinalState
+        self._epsilon = epsilon
+        self.veto = False
+        self.isGood = True
+        
@@ -0,0 +1,154 @@
+from __future__ import division, print_function
+import os
+
+_hbar = 6.582119569e-25 #GeV s
+_bundled = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        'pdgtable.dat')
+
+
+class ParticleProperties(object):
+    """Mass and width in GeV, charge in units of e and lifetime in s."""
+    __slots__ = ('pdgid', 'name', 'mass', 'width', 'charge', 'lifetime')
+
+    def __init__(self, pdgid, name, mass, width, charge, lifetime):
+        self.pdgid = pdgid
+        self.name = name
+        self.mass = mass
+        self.width = width
+        self.charge = charge
+        self.lifetime = lifetime
+        return
+
+
+    def __repr__(self):
+        return '%s(%d, m=%g, w=%g, q=%g, tau=%g)' % (
+            self.name, self.pdgid, self.mass, self.width, self.charge,
+            self.lifetime)
+
+
+class ParticleTable(object):
+    """In-process table of particle properties keyed by PDG id, loaded from
+    a compact text file. Antiparticles are looked up by |pdgid| with the
+    charge flipped."""
+
+
+    def __init__(self, path=None):
+        self._particles = {}
+        if( path is not None ):
+            self.Load(path)
+        return
+
+
+    def Load(self, path):
+        """Add the particles listed in a table file."""
+        with open(path) as f:
+            for line in f:
+                line = line.split('#')[0].split()
+                if( not line ):
+                    continue
+                pdgid, name, mass, width, threeCharge, lifetime = line
+                self.Add(int(pdgid), name, float(mass), float(width),
+                         int(threeCharge) / 3., float(lifetime))
+        return self
+
+
+    def Add(self, pdgid, name, mass, width, charge, lifetime=0.):
+        """Add a particle. A lifetime of 0 is derived from the width."""
+        if( lifetime == 0 ):
+            lifetime = _hbar / width if width > 0 else float('inf')
+        self._particles[abs(pdgid)] = ParticleProperties(
+            abs(pdgid), name, mass, width, charge if pdgid > 0 else -charge,
+            lifetime)
+        return
+
+
+    def __contains__(self, pdgid):
+        return abs(pdgid) in self._particles
+
+
+    def Get(self, pdgid):
+        """Return the ParticleProperties of a PDG id."""
+        p = self._particles[abs(pdgid)]
+        if( pdgid < 0 ):
+            return ParticleProperties(pdgid, p.name, p.mass, p.width,
+                                      -p.charge, p.lifetime)
+        return p
+
+
+    __getitem__ = Get
+
+
+    def Mass(self, pdgid):
+        return self._particles[abs(pdgid)].mass
+
+
+    def Width(self, pdgid):
+        return self._particles[abs(pdgid)].width
+
+
+    def Charge(self, pdgid):
+        charge = self._particles[abs(pdgid)].charge
+        return charge if pdgid > 0 else -charge
+
+
+    def Lifetime(self, pdgid):
+        return self._particles[abs(pdgid)].lifetime
+
+
+    def Column(self, pdgids, quantity='mass'):
+        """Return a quantity for an array of PDG ids as a NumPy array, e.g.
+        the masses of a whole batch of daughters."""
+        import numpy as np
+        pdgids = np.asarray(pdgids)
+        ids, inverse = np.unique(np.abs(pdgids), return_inverse=True)
+        values = np.array([getattr(self._particles[i], quantity)
+                           for i in ids.tolist()], dtype=np.float64)
+        result = values[inverse].reshape(pdgids.shape)
+        if( quantity == 'charge' ):
+            result = np.where(pdgids < 0, -result, result)
+        return result
+
+
+    def Save(self, path):
+        """Write the table in the format read by Load."""
+        with open(path, 'w') as f:
+            f.write('# pdgid name mass[GeV] width[GeV] threeCharge '
+                    'lifetime[s]\n')
+            for pdgid in sorted(self._particles):
+                p = self._particles[pdgid]
+                f.write('%-5d %-8s %-16r %-13r %2d  %r\n' % (
+                    pdgid, p.name, p.mass, p.width, int(round(3*p.charge)),
+                    p.lifetime))
+        return
+
+
+def buildFromPyPDT(pdgids, path=None):
+    """Build a table for the given PDG ids from pypdt, once, and write it
+    to path if given so later runs need not import pypdt."""
+    import pypdt
+    table = ParticleTable()
+    for pdgid in pdgids:
+        #The table holds particles; antiparticles are derived from them.
+        pdgid = abs(pdgid)
+        p = pypdt.get(pdgid)
+        threeCharge = getattr(p, 'threecharge', None)
+        if( threeCharge is None ):
+            threeCharge = 3 * getattr(p, 'charge', 0)
+        #The lifetime is derived from the width.
+        table.Add(pdgid, getattr(p, 'name', str(pdgid)).replace(' ', '_'),
+                  p.mass, p.width, threeCharge / 3.)
+    if( path is not None ):
+        table.Save(path)
+    return table
+
+
+_default = None
+
+
+def defaultTable():
+    """Return the table loaded from the bundled pdgtable.dat, reading the
+    file only on first use."""
+    global _default
+    if( _default is None ):
+        _default = ParticleTable(_bundled)
+    return _default
@@ -0,0 +1,178 @@
+from __future__ import division, print_function
+from timeit import default_timer as _timer
+
+
+class _StageTimer(object):
+    """Context manager adding its elapsed time to one profiler stage and
+    marking the stage nested if another one was open."""
+    __slots__ = ('_profiler', '_stage', '_events', '_start')
+
+    def __init__(self, profiler, stage, events):
+        self._profiler = profiler
+        self._stage = stage
+        self._events = events
+        return
+
+
+    def __enter__(self):
+        profiler = self._profiler
+        if( profiler._depth ):
+            self._stage[3] = True
+        profiler._depth += 1
+        self._start = _timer()
+        return self
+
+
+    def __exit__(self, *args):
+        stage = self._stage
+        stage[0] += 1
+        stage[1] += _timer() - self._start
+        stage[2] += self._events
+        self._profiler._depth -= 1
+        return False
+
+
+class Profiler(object):
+    """Records per-stage wall time, calls and events, plus named counters
+    (e.g. isGood=False events and vetoes), for a generation run. Stages are
+    timed with
+        with profiler.Stage('decay', len(chunk)):
+            ...
+    and profilers from parallel shards combine with Merge. A stage timed
+    inside another one, like 'boost' inside 'decay', is marked nested."""
+    enabled = True
+
+    def __init__(self):
+        self._stages = {}
+        self._order = []
+        self._depth = 0
+        self.counters = {}
+        self._start = _timer()
+        return
+
+
+    def Stage(self, name, events=0):
+        """Return a context manager timing one call of the stage."""
+        if( name not in self._stages ):
+            self._stages[name] = [0, 0., 0, False]
+            self._order.append(name)
+        return _StageTimer(self, self._stages[name], events)
+
+
+    def Count(self, name, n=1):
+        """Add n to a named counter."""
+        self.counters[name] = self.counters.get(name, 0) + n
+        return
+
+
+    def Wrap(self, func, name):
+        """Return func timed as the stage name, e.g. for the sinks given to
+        stream.consume. The first argument's len() is counted as events."""
+        def wrapped(chunk, *args, **kwargs):
+            with self.Stage(name, len(chunk)):
+                return func(chunk, *args, **kwargs)
+        return wrapped
+
+
+    def Summary(self):
+        """Return the results as a dict of plain types."""
+        stages = []
+        for name in self._order:
+            calls, seconds, events, nested = self._stages[name]
+            stages.append({'name': name, 'calls': calls, 'seconds': seconds,
+                           'events': events, 'nested': nested,
+                           'eventsPerSec': (events / seconds if seconds > 0
+                                            else 0.)})
+        return {'wallSeconds': _timer() - self._start, 'stages': stages,
+                'counters': dict(self.counters)}
+
+
+    def ToJSON(self, path=None):
+        """Return the summary as JSON, also writing it to path if given."""
+        import json
+        text = json.dumps(self.Summary(), indent=1, sort_keys=True)
+        if( path is not None ):
+            with open(path, 'w') as f:
+                f.write(text)
+        return text
+
+
+    def Print(self):
+        """Print the stages with their share of the total time of the
+        outermost stages; nested stages are indented, their share overlaps
+        the stage they run in."""
+        summary = self.Summary()
+        total = sum(s['seconds'] for s in summary['stages']
+                    if not s['nested'])
+        print('%-12s %8s %10s %6s %14s %14s' % ('stage', 'calls', 'seconds',
+                                               '%', 'events', 'events/s'))
+        for s in summary['stages']:
+            print('%-12s %8d %10.4f %6.1f %14d %14.0f' % (
+                ('  ' if s['nested'] else '') + s['name'], s['calls'],
+                s['seconds'],
+                100. * s['seconds'] / total if total else 0., s['events'],
+                s['eventsPerSec']))
+        for name in sorted(summary['counters']):
+            print('%-12s %d' % (name, summary['counters'][name]))
+        return
+
+
+    def Merge(self, other):
+        """Add the stages and counters of another profiler."""
+        for name in other._order:
+            if( name not in self._stages ):
+                self._stages[name] = [0, 0., 0, False]
+                self._order.append(name)
+            stage = self._stages[name]
+            for i in range(3):
+                stage[i] += other._stages[name][i]
+            stage[3] = stage[3] or other._stages[name][3]
+        for name, n in other.counters.items():
+            self.Count(name, n)
+        return self
+
+
+class _NullContext(object):
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *args):
+        return False
+
+
+_nullContext = _NullContext()
+
+
+class NullProfiler(object):
+    """Profiler that records nothing, used when profiling is disabled. Its
+    Stage returns one shared no-op context manager."""
+    enabled = False
+    counters = {}
+
+    def Stage(self, name, events=0):
+        return _nullContext
+
+
+    def Count(self, name, n=1):
+        return
+
+
+    def Wrap(self, func, name):
+        return func
+
+
+    def Merge(self, other):
+        return self
+
+
+NULL = NullProfiler()
+
+
+def getProfiler(profiler=None):
+    """Return profiler, or the disabled NULL profiler if it is None."""
+    if( profiler is None ):
+        return NULL
+    return profiler
@@ -0,0 +1,169 @@
+from __future__ import division, print_function
+from math import sqrt as _sqrt, pi as _pi
+import numpy as _np
+from .distributions import getStream, pdgProperties
+
+
+class InverseCDFSampler(object):
+    """Samples a one-dimensional pdf on [minimum, maximum] by tabulating its
+    cumulative distribution once on a grid and inverting it by linear
+    interpolation. pdf is called once with the array of grid points and
+    need not be normalized. Pass grid to use your own (sorted) points."""
+
+
+    def __init__(self, pdf, minimum=None, maximum=None, nGrid=4096,
+                 grid=None):
+        if( grid is None ):
+            grid = _np.linspace(minimum, maximum, nGrid)
+        self.grid = _np.asarray(grid, dtype=_np.float64)
+        p = _np.clip(_np.asarray(pdf(self.grid), dtype=_np.float64), 0, None)
+        cdf = _np.empty_like(self.grid)
+        cdf[0] = 0.
+        _np.cumsum(0.5 * (p[1:] + p[:-1]) * _np.diff(self.grid), out=cdf[1:])
+        if( cdf[-1] <= 0 ):
+            raise RuntimeError('pdf integrates to zero on the grid.')
+        self.norm = cdf[-1]
+        self.cdf = cdf / cdf[-1]
+        return
+
+
+    def Sample(self, size=None, rng=None):
+        """Return size values drawn from the pdf."""
+        u = getStream(rng).random(size)
+        return _np.interp(u, self.cdf, self.grid)
+
+
+    __call__ = Sample
+
+
+class AliasTable(object):
+    """Walker alias table for drawing from a discrete distribution in
+    constant time per sample. weights need not be normalized. If values is
+    given the samples are values[i], and if edges (len(weights)+1 bin edges)
+    is given the samples are spread uniformly within the chosen bin."""
+
+
+    def __init__(self, weights, values=None, edges=None):
+        w = _np.asarray(weights, dtype=_np.float64)
+        n = len(w)
+        if( n == 0 or w.sum() <= 0 ):
+            raise RuntimeError('Alias table needs positive total weight.')
+        scaled = w * (n / w.sum())
+        prob = _np.ones(n)
+        alias = _np.arange(n)
+        small = [i for i in range(n) if scaled[i] < 1.]
+        large = [i for i in range(n) if scaled[i] >= 1.]
+        while( small and large ):
+            s = small.pop()
+            l = large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] -= 1. - scaled[s]
+            if( scaled[l] < 1. ):
+                small.append(l)
+            else:
+                large.append(l)
+        self.prob = prob
+        self.alias = alias
+        self.values = None if values is None else _np.asarray(values)
+        self.edges = None if edges is None else _np.asarray(edges,
+                                                            dtype=_np.float64)
+        return
+
+
+    def SampleIndex(self, size=None, rng=None):
+        """Return indices drawn with probability proportional to weights,
+        a single int for size=None."""
+        rng = getStream(rng)
+        n = len(self.prob)
+        i = _np.minimum((_np.asarray(rng.random(size)) * n).astype(_np.intp),
+                        n - 1)
+        keep = rng.random(size) < self.prob[i]
+        i = _np.where(keep, i, self.alias[i])
+        if( size is None ):
+            return int(i)
+        return i
+
+
+    def Sample(self, size=None, rng=None):
+        """Return samples as described in the class docstring."""
+        rng = getStream(rng)
+        i = self.SampleIndex(size, rng)
+        if( self.edges is not None ):
+            lo = self.edges[i]
+            return lo + (self.edges[i + 1] - lo) * rng.random(size)
+        if( self.values is not None ):
+            return self.values[i]
+        return i
+
+
+    __call__ = Sample
+
+
+def breitWignerPDF(m, mass, width):
+    """Relativistic Breit-Wigner line shape in the invariant mass m,
+    k / ((m^2 - M^2)^2 + M^2 Gamma^2), normalized over m > 0 for narrow
+    widths."""
+    g = _sqrt(mass**2 * (mass**2 + width**2))
+    k = 2 * _sqrt(2) * mass * width * g / (_pi * _sqrt(mass**2 + g))
+    return k / ((m**2 - mass**2)**2 + mass**2 * width**2)
+
+
+class BreitWigner(InverseCDFSampler):
+    """Relativistic Breit-Wigner mass sampler on [minimum, maximum],
+    defaulting to nWidths widths around the pole (cut at zero). The grid is
+    denser near the pole so the peak is resolved with few points."""
+
+
+    def __init__(self, mass, width, minimum=None, maximum=None, nWidths=50,
+                 nGrid=4096):
+        self.mass = mass
+        self.width = width
+        if( minimum is None ):
+            minimum = max(0., mass - nWidths * width)
+        if( maximum is None ):
+            maximum = mass + nWidths * width
+        #Points equally spaced in the Cauchy CDF cluster around the pole.
+        lo = _np.arctan((minimum - mass) / (0.5 * width))
+        hi = _np.arctan((maximum - mass) / (0.5 * width))
+        grid = mass + 0.5 * width * _np.tan(_np.linspace(lo, hi, nGrid))
+        grid[0] = minimum
+        grid[-1] = maximum
+        super(BreitWigner, self).__init__(
+            lambda m: breitWignerPDF(m, mass, width), grid=grid)
+        return
+
+
+_bwSamplers = {}
+_pdgSamplers = {}
+
+
+def breitWigner(mass, width, minimum=None, maximum=None):
+    """Return a cached BreitWigner sampler for the given pole, width and
+    range, e.g. minimum at the threshold of the decay."""
+    key = (mass, width, minimum, maximum)
+    if( key not in _bwSamplers ):
+        _bwSamplers[key] = BreitWigner(mass, width, minimum, maximum)
+    return _bwSamplers[key]
+
+
+def pdgSampler(pdgid, shape='breitwigner', minimum=None, maximum=None):
+    """Return a cached mass sampler for a PDG id. shape is 'breitwigner'
+    or 'gauss'; minimum and maximum limit the Breit-Wigner range. The
+    particle properties are looked up only once."""
+    key = (pdgid, shape, minimum, maximum)
+    if( key not in _pdgSamplers ):
+        mass, width = pdgProperties(pdgid)
+        if( width <= 0 ):
+            _pdgSamplers[key] = (lambda size=None, rng=None:
+                                 mass if size is None else
+                                 _np.full(size, float(mass)))
+        elif( shape == 'breitwigner' ):
+            _pdgSamplers[key] = breitWigner(mass, width, minimum, maximum)
+        elif( shape == 'gauss' ):
+            sigma = width / 2.3548200450309493
+            _pdgSamplers[key] = (lambda size=None, rng=None:
+                                 getStream(rng).normal(mass, sigma, size))
+        else:
+            raise RuntimeError('Unknown mass shape %s.' % shape)
+    return _pdgSamplers[key]
@@ -0,0 +1,307 @@
+from __future__ import division, print_function
+import numpy as _np
+from .stream import vetoStage
+
+
+class KinematicCache(object):
+    """Quantities derived from one batch of particles, computed on first
+    use and shared by every cut evaluated on that batch."""
+
+
+    def __init__(self, particles):
+        self.particles = particles
+        self._cache = {}
+        return
+
+
+    def Get(self, name, quantity):
+        """Return particles[name].quantity(), computing it only once."""
+        key = (name, quantity)
+        if( key not in self._cache ):
+            self._cache[key] = getattr(self.particles[name], quantity)()
+        return self._cache[key]
+
+
+    def Pt(self, name):
+        return self.Get(name, 'Pt')
+
+
+    def Eta(self, name):
+        return self.Get(name, 'Eta')
+
+
+    def AbsEta(self, name):
+        key = (name, 'AbsEta')
+        if( key not in self._cache ):
+            self._cache[key] = _np.abs(self.Eta(name))
+        return self._cache[key]
+
+
+    def Phi(self, name):
+        return self.Get(name, 'Phi')
+
+
+    def DeltaR(self, name1, name2):
+        """Return delta R between two particles, built from the cached eta
+        and phi."""
+        key = (name1, name2, 'DeltaR')
+        if( key not in self._cache ):
+            dPhi = self.Phi(name1) - self.Phi(name2)
+            dPhi = (dPhi + _np.pi) % (2 * _np.pi) - _np.pi
+            self._cache[key] = _np.hypot(self.Eta(name1) - self.Eta(name2),
+                                         dPhi)
+        return self._cache[key]
+
+
+    def Mass(self, names):
+        """Return the invariant mass of the sum of the named particles."""
+        key = (tuple(names), 'M')
+        if( key not in self._cache ):
+            total = self.particles[names[0]]
+            for name in names[1:]:
+                total = total + self.particles[name]
+            self._cache[key] = total.M()
+        return self._cache[key]
+
+
+class Cut(object):
+    """Base class for cuts. Mask(cache) returns True for passing events.
+    Cuts combine with &, | and ~."""
+
+
+    def Mask(self, cache):
+        raise NotImplementedError
+
+
+    def __and__(self, other):
+        return And(self, other)
+
+
+    def __or__(self, other):
+        return Or(self, other)
+
+
+    def __invert__(self):
+        return Not(self)
+
+
+class PtCut(Cut):
+    """Pass events where the particle has Pt > minimum, the complement of
+    Particle.PTCuts."""
+
+
+    def __init__(self, name, minimum):
+        self.name = name
+        self.minimum = minimum
+        return
+
+
+    def Mask(self, cache):
+        return cache.Pt(self.name) > self.minimum
+
+
+class EtaCut(Cut):
+    """Pass events where the particle has |Eta| < maximum, the complement
+    of Particle.EtaCuts."""
+
+
+    def __init__(self, name, maximum):
+        self.name = name
+        self.maximum = maximum
+        return
+
+
+    def Mask(self, cache):
+        return cache.AbsEta(self.name) < self.maximum
+
+
+class DeltaRCut(Cut):
+    """Pass events where minimum < DeltaR(name1, name2) < maximum."""
+
+
+    def __init__(self, name1, name2, minimum=0., maximum=_np.inf):
+        self.names = (name1, name2)
+        self.minimum = minimum
+        self.maximum = maximum
+        return
+
+
+    def Mask(self, cache):
+        dR = cache.DeltaR(*self.names)
+        return (dR > self.minimum) & (dR < self.maximum)
+
+
+class MassWindow(Cut):
+    """Pass events where the invariant mass of the named particles lies in
+    [low, high]."""
+
+
+    def __init__(self, names, low, high):
+        self.names = tuple(names)
+        self.low = low
+        self.high = high
+        return
+
+
+    def Mask(self, cache):
+        m = cache.Mass(self.names)
+        return (m >= self.low) & (m <= self.high)
+
+
+class FunctionCut(Cut):
+    """Cut defined by func(cache) returning a boolean mask."""
+
+
+    def __init__(self, func):
+        self.func = func
+        return
+
+
+    def Mask(self, cache):
+        return _np.asarray(self.func(cache), dtype=bool)
+
+
+class And(Cut):
+    """Pass events passing every one of the cuts."""
+
+
+    def __init__(self, *cuts):
+        self.cuts = cuts
+        return
+
+
+    def Mask(self, cache):
+        mask = self.cuts[0].Mask(cache)
+        for cut in self.cuts[1:]:
+            mask = mask & cut.Mask(cache)
+        return mask
+
+
+class Or(Cut):
+    """Pass events passing any of the cuts."""
+
+
+    def __init__(self, *cuts):
+        self.cuts = cuts
+        return
+
+
+    def Mask(self, cache):
+        mask = self.cuts[0].Mask(cache)
+        for cut in self.cuts[1:]:
+            mask = mask | cut.Mask(cache)
+        return mask
+
+
+class Not(Cut):
+    """Pass events failing the cut."""
+
+
+    def __init__(self, cut):
+        self.cut = cut
+        return
+
+
+    def Mask(self, cache):
+        return ~self.cut.Mask(cache)
+
+
+class Selection(object):
+    """Ordered list of named cuts evaluated over event batches, keeping a
+    cut flow of how many events, and how much weight, survive each
+    successive cut. Events arriving as not good or vetoed are counted in
+    total but not in accepted, the input of the first cut."""
+
+
+    def __init__(self):
+        self._cuts = []
+        self.total = 0
+        self.totalWeight = 0.
+        self.accepted = 0
+        self.acceptedWeight = 0.
+        self.passed = []
+        self.passedWeight = []
+        return
+
+
+    def Add(self, name, cut):
+        """Append a cut to the selection."""
+        self._cuts.append((name, cut))
+        self.passed.append(0)
+        self.passedWeight.append(0.)
+        return self
+
+
+    def Evaluate(self, particles, isGood=None, weights=None):
+        """Return the mask of events in the batch passing every cut and
+        update the cut flow. particles maps names to VecFourArrays; events
+        with isGood False fail and are left out of accepted."""
+        cache = KinematicCache(particles)
+        if( isGood is None ):
+            mask = _np.ones(len(next(iter(particles.values()))), dtype=bool)
+        else:
+            mask = _np.array(isGood, dtype=bool)
+        self.total += len(mask)
+        self.totalWeight += (len(mask) if weights is None else
+                             float(weights.sum()))
+        self.accepted += int(mask.sum())
+        self.acceptedWeight += (int(mask.sum()) if weights is None else
+                                float(weights[mask].sum()))
+        for i, (name, cut) in enumerate(self._cuts):
+            mask &= cut.Mask(cache)
+            self.passed[i] += int(mask.sum())
+            self.passedWeight[i] += (int(mask.sum()) if weights is None else
+                                     float(weights[mask].sum()))
+        return mask
+
+
+    def Stage(self, chunks, profiler=None):
+        """Stream stage vetoing the events of each EventChunk that fail.
+        Events already vetoed by an earlier stage fail and are left out of
+        accepted."""
+        return vetoStage(chunks,
+                         lambda c: ~self.Evaluate(c.particles, c.Accepted(),
+                                                  c.weights),
+                         profiler)
+
+
+    def CutFlow(self, weighted=False):
+        """Return a list of (name, passed, efficiency, cumulative
+        efficiency) for the 'input' events, the accepted ones, and every
+        cut, in order. With weighted=True passed is the sum of weights and
+        the efficiencies are weighted."""
+        if( weighted ):
+            total, accepted = self.totalWeight, self.acceptedWeight
+            counts = self.passedWeight
+        else:
+            total, accepted, counts = self.total, self.accepted, self.passed
+        eff = accepted / total if total else 0.
+        flow = [('input', accepted, eff, eff)]
+        previous = accepted
+        for (name, cut), passed in zip(self._cuts, counts):
+            eff = passed / previous if previous else 0.
+            cumulative = passed / total if total else 0.
+            flow.append((name, passed, eff, cumulative))
+            previous = passed
+        return flow
+
+
+    def PrintCutFlow(self):
+        print('%-20s %12s %8s %8s' % ('cut', 'passed', 'eff', 'cum'))
+        print('%-20s %12d' % ('total', self.total))
+        for name, passed, eff, cumulative in self.CutFlow():
+            print('%-20s %12d %8.4f %8.4f' % (name, passed, eff, cumulative))
+        return
+
+
+    def Merge(self, other):
+        """Add the cut flow of another selection with the same cuts, e.g.
+        from a parallel shard."""
+        self.total += other.total
+        self.totalWeight += other.totalWeight
+        self.accepted += other.accepted
+        self.acceptedWeight += other.acceptedWeight
+        self.passed = [a + b for a, b in zip(self.passed, other.passed)]
+        self.passedWeight = [a + b for a, b in zip(self.passedWeight,
+                                                   other.passedWeight)]
+        return self
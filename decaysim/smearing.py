@@ -0,0 +1,170 @@
+from __future__ import division, print_function
+import numpy as _np
+from .vectorarray import VecFourArray
+from .distributions import getStream
+from .profiling import getProfiler
+
+
+class TrackerResolution(object):
+    """Relative pT resolution sigma(pT)/pT = a (+) b*pT, added in quadrature,
+    with b scaled by 1 + c*|eta|^2 to model the loss of lever arm in the
+    forward region."""
+
+
+    def __init__(self, a=0.01, b=1e-4, c=0.):
+        self.a = a
+        self.b = b
+        self.c = c
+        return
+
+
+    def __call__(self, pt, eta):
+        b = self.b * (1. + self.c * eta * eta)
+        return _np.sqrt(self.a**2 + (b * pt)**2)
+
+
+class CaloResolution(object):
+    """Relative energy resolution sigma(E)/E = stochastic/sqrt(E) (+)
+    constant (+) noise/E, added in quadrature, with E = pT cosh(eta). Used
+    as a pT resolution it smears pT at fixed eta, i.e. the energy."""
+
+
+    def __init__(self, stochastic=0.5, constant=0.03, noise=0.):
+        self.stochastic = stochastic
+        self.constant = constant
+        self.noise = noise
+        return
+
+
+    def __call__(self, pt, eta):
+        e = _np.maximum(pt * _np.cosh(_np.minimum(_np.abs(eta), 700.)),
+                        1e-300)
+        return _np.sqrt(self.stochastic**2 / e + self.constant**2 +
+                        (self.noise / e)**2)
+
+
+class BinnedMap(object):
+    """Table of values in bins of pT and |eta|, e.g. a tabulated resolution
+    or an efficiency map. table has shape (len(ptEdges) - 1,
+    len(etaEdges) - 1); values outside the edges take the nearest bin."""
+
+
+    def __init__(self, ptEdges, etaEdges, table):
+        self.ptEdges = _np.asarray(ptEdges, dtype=_np.float64)
+        self.etaEdges = _np.asarray(etaEdges, dtype=_np.float64)
+        self.table = _np.asarray(table, dtype=_np.float64)
+        if( self.table.shape != (len(self.ptEdges) - 1,
+                                 len(self.etaEdges) - 1) ):
+            raise RuntimeError('The table does not match the bin edges.')
+        return
+
+
+    def __call__(self, pt, eta):
+        i = _np.searchsorted(self.ptEdges, pt, side='right') - 1
+        j = _np.searchsorted(self.etaEdges, _np.abs(eta), side='right') - 1
+        i = _np.clip(i, 0, len(self.ptEdges) - 2)
+        j = _np.clip(j, 0, len(self.etaEdges) - 2)
+        return self.table[i, j]
+
+
+def _Evaluate(value, pt, eta):
+    """Return value(pt, eta) if it is callable, else the constant value."""
+    if( callable(value) ):
+        return value(pt, eta)
+    return value
+
+
+class Smearer(object):
+    """Detector response for a batch of particles. ptResolution is the
+    relative resolution sigma(pT)/pT, etaResolution and phiResolution the
+    absolute ones, and efficiency the probability to detect a particle.
+    Each is None, a constant or a function f(pt, eta) of the true pT and
+    eta arrays, like TrackerResolution, CaloResolution and BinnedMap.
+    Gaussian smearing is applied to pT, eta and phi in one pass, and E is
+    recomputed from the smeared momentum and the particle mass."""
+
+
+    def __init__(self, ptResolution=None, etaResolution=None,
+                 phiResolution=None, efficiency=None):
+        self.ptResolution = ptResolution
+        self.etaResolution = etaResolution
+        self.phiResolution = phiResolution
+        self.efficiency = efficiency
+        return
+
+
+    def Smear(self, vecs, rng=None, m=None, out=None):
+        """Return the smeared VecFourArray and the mask of detected
+        particles. m is the mass (scalar or per-particle) used for E, the
+        invariant mass of vecs by default. Smeared pT below 0 is set to 0.
+        out may be vecs to smear in place."""
+        rng = getStream(rng)
+        n = len(vecs)
+        if( m is None ):
+            m = _np.sqrt(_np.maximum(vecs.M2(), 0.))
+        pt = vecs.Pt()
+        eta = vecs.Eta()
+        phi = vecs.Phi()
+        pz = vecs.Data()[2].copy()
+
+        sigma = _Evaluate(self.ptResolution, pt, eta)
+        newPt = pt
+        if( sigma is not None ):
+            newPt = _np.maximum(pt * (1. + sigma * rng.normal(0., 1., n)),
+                                0.)
+        newEta = eta
+        sigma = _Evaluate(self.etaResolution, pt, eta)
+        if( sigma is not None ):
+            newEta = eta + sigma * rng.normal(0., 1., n)
+        sigma = _Evaluate(self.phiResolution, pt, eta)
+        if( sigma is not None ):
+            phi = phi + sigma * rng.normal(0., 1., n)
+
+        #Particles along the beam (pT = 0, eta = +-1e72) keep their pz.
+        with _np.errstate(over='ignore', invalid='ignore'):
+            newPz = _np.where(pt > 0, newPt * _np.sinh(newEta), pz)
+        if( out is None ):
+            out = VecFourArray.Empty(n)
+        d = out.Data()
+        d[0] = newPt * _np.cos(phi)
+        d[1] = newPt * _np.sin(phi)
+        d[2] = newPz
+        d[3] = _np.sqrt(out.P2() + m**2)
+
+        efficiency = _Evaluate(self.efficiency, pt, eta)
+        if( efficiency is None ):
+            detected = _np.ones(n, dtype=bool)
+        else:
+            detected = rng.random(n) < efficiency
+        return out, detected
+
+
+    def __call__(self, vecs, rng=None, m=None, out=None):
+        return self.Smear(vecs, rng, m, out)
+
+
+def smearStage(chunks, smearer, names=('d1', 'd2'), rng=None, masses=None,
+               suffix=None, profiler=None):
+    """Smear the named particles of every chunk with a Smearer. masses maps
+    a name to its mass for E, the particle's invariant mass by default.
+    With a suffix the smeared batches are added as name + suffix and the
+    true ones kept; otherwise they are replaced in place. Events with an
+    undetected particle are vetoed. A profiler times this as the
+    'smearing' stage and counts the newly vetoed events as 'undetected'."""
+    rng = getStream(rng)
+    profiler = getProfiler(profiler)
+    masses = masses or {}
+    for chunk in chunks:
+        with profiler.Stage('smearing', len(chunk)):
+            fail = _np.zeros(len(chunk), dtype=bool)
+            for name in names:
+                vecs = chunk.particles[name]
+                smeared, detected = smearer.Smear(
+                    vecs, rng, masses.get(name),
+                    out=None if suffix else vecs)
+                chunk.particles[name + (suffix or '')] = smeared
+                fail |= ~detected
+            if( profiler.enabled ):
+                profiler.Count('undetected', int((fail & ~chunk.veto).sum()))
+            chunk.veto |= fail
+        yield chunk
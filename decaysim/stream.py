@@ -0,0 +1,180 @@
+from __future__ import division, print_function
+import numpy as _np
+from .distributions import getStream
+from .batchdecay import particleBatch, decayBatch, decayBatchN
+from .profiling import getProfiler
+
+
+class EventChunk(object):
+    """Block of events. particles maps a name to a VecFourArray, isGood and
+    veto are boolean masks with the meaning they have on Particle, weights
+    are the per-event weights (1 unless importance sampling was used) and
+    columns holds derived per-event observables added by later stages."""
+
+
+    def __init__(self, particles, isGood, veto=None, weights=None):
+        self.particles = particles
+        self.isGood = isGood
+        if( veto is None ):
+            veto = _np.zeros(len(isGood), dtype=bool)
+        self.veto = veto
+        if( weights is None ):
+            weights = _np.ones(len(isGood))
+        self.weights = weights
+        self.columns = {}
+        return
+
+
+    def __len__(self):
+        return len(self.isGood)
+
+
+    def __getitem__(self, name):
+        """Return a particle batch or a derived column by name."""
+        if( name in self.particles ):
+            return self.particles[name]
+        return self.columns[name]
+
+
+    def Accepted(self):
+        """Return the mask of good, non-vetoed events."""
+        return self.isGood & ~self.veto
+
+
+    def Select(self, mask):
+        """Return a new chunk holding only the events in mask."""
+        chunk = EventChunk(dict((k, v[mask]) for k, v in
+                                self.particles.items()),
+                           self.isGood[mask], self.veto[mask],
+                           self.weights[mask])
+        chunk.columns = dict((k, v[mask]) for k, v in self.columns.items())
+        return chunk
+
+
+def _Draw(value, n, rng, weights):
+    """Return value, or value(n, rng) if it is a sampler. A sampler may
+    return (values, weights), which are multiplied into weights."""
+    if( callable(value) ):
+        value = value(n, rng)
+        if( isinstance(value, tuple) ):
+            value, w = value
+            weights *= w
+    return value
+
+
+def generateChunks(nEvents, chunkSize=100000, m=None, pt=0, pz=0, dM1=0,
+                   dM2=0, rng=None, chain=None, epsilon=1e-7, profiler=None,
+                   angular=None, cosTheta=None, masses=None):
+    """Yield EventChunks of at most chunkSize events until nEvents have
+    been produced. m, pt and pz are scalars or samplers called as
+    f(n, rng), e.g. lambda n, rng: randExp(size=n, rng=rng). Without a chain
+    the mothers decay into 'd1' and 'd2' and m defaults to 91.188; with a
+    DecayChain the particles are named after its nodes, the mother is its
+    root and m defaults to the root's mass. A chunk is only
+    valid until the next one is requested. A profiling.Profiler times the
+    sampling, decay and boost stages. Samplers returning (values, weights),
+    like those in importance, make a weighted sample. angular is the
+    angular.AngularDistribution of the two-body decay and cosTheta an
+    optional sampler of its cos(theta) overriding it. Given a list of
+    daughter masses the mothers instead decay uniformly in N-body phase
+    space into 'd1', 'd2', ..., with the phase-space weights multiplied
+    into the event weights, as are those of N-body nodes of a chain."""
+    rng = getStream(rng)
+    profiler = getProfiler(profiler)
+    if( m is None ):
+        m = 91.188 if chain is None else chain.root.m
+    done = 0
+    while( done < nEvents ):
+        n = min(chunkSize, nEvents - done)
+        weights = _np.ones(n)
+        with profiler.Stage('sampling', n):
+            mass = _Draw(m, n, rng, weights)
+            mothers = particleBatch(mass, _Draw(pt, n, rng, weights),
+                                    _Draw(pz, n, rng, weights), n, rng)
+            angles = (None if cosTheta is None else
+                      _Draw(cosTheta, n, rng, weights))
+        with profiler.Stage('decay', n):
+            if( chain is not None ):
+                particles, isGood = chain.Generate(mothers, rng, mass,
+                                                   profiler, weights)
+            elif( masses is not None ):
+                ds, w, isGood = decayBatchN(mothers, masses, rng, mass,
+                                            epsilon, profiler=profiler)
+                weights *= w
+                particles = dict(('d%d' % (i + 1), d)
+                                 for i, d in enumerate(ds))
+                particles['mother'] = mothers
+            else:
+                d1, d2, isGood = decayBatch(mothers, dM1, dM2, rng, mass,
+                                            epsilon, profiler=profiler,
+                                            angular=angular,
+                                            cosTheta=angles)
+                particles = {'mother': mothers, 'd1': d1, 'd2': d2}
+        yield EventChunk(particles, isGood, weights=weights)
+        done += n
+    return
+
+
+def vetoStage(chunks, func, profiler=None):
+    """Veto the events where func(chunk) is True. A profiler times this as
+    the 'cuts' stage and counts the newly vetoed events."""
+    profiler = getProfiler(profiler)
+    for chunk in chunks:
+        with profiler.Stage('cuts', len(chunk)):
+            fail = func(chunk)
+            if( profiler.enabled ):
+                profiler.Count('veto', int((fail & ~chunk.veto).sum()))
+            chunk.veto |= fail
+        yield chunk
+
+
+def ptCuts(chunks, cut, names=('d1', 'd2'), profiler=None):
+    """Veto events where any of the named particles has Pt <= cut."""
+    def fail(chunk):
+        mask = _np.zeros(len(chunk), dtype=bool)
+        for name in names:
+            mask |= chunk.particles[name].Pt() <= cut
+        return mask
+    return vetoStage(chunks, fail, profiler)
+
+
+def etaCuts(chunks, cut, names=('d1', 'd2'), profiler=None):
+    """Veto events where any of the named particles has |Eta| >= cut."""
+    def fail(chunk):
+        mask = _np.zeros(len(chunk), dtype=bool)
+        for name in names:
+            mask |= _np.abs(chunk.particles[name].Eta()) >= cut
+        return mask
+    return vetoStage(chunks, fail, profiler)
+
+
+def observe(chunks, name, func):
+    """Add the column func(chunk) to every chunk under name."""
+    for chunk in chunks:
+        chunk.columns[name] = func(chunk)
+        yield chunk
+
+
+def mapChunks(chunks, func):
+    """Replace every chunk by func(chunk), dropping it if that is None."""
+    for chunk in chunks:
+        chunk = func(chunk)
+        if( chunk is not None ):
+            yield chunk
+
+
+def accepted(chunks):
+    """Keep only the good, non-vetoed events of every chunk."""
+    for chunk in chunks:
+        yield chunk.Select(chunk.Accepted())
+
+
+def consume(chunks, *sinks):
+    """Drive the pipeline, calling every sink on every chunk. Return the
+    number of events seen."""
+    nEvents = 0
+    for chunk in chunks:
+        for sink in sinks:
+            sink(chunk)
+        nEvents += len(chunk)
+    return nEvents
@@ -0,0 +1,189 @@
+from __future__ import division
+from math import pi as _pi, sqrt as _sqrt, atanh as _atanh, atan2 as _atan2
+
+
+def Eta(pz, p):
+    """Calculate pseudorapidity of a particle from pz and p."""
+    try:
+        eta = _atanh(pz / p)
+    except ZeroDivisionError:
+        eta = _atanh(pz / (p + 1e-10))
+    return eta
+
+
+def Phi(py, px):
+    """Calculate phi of a particle."""
+    phi = _atan2(py, px)
+    if( phi < 0 ):
+        phi += 2 * _pi
+    return phi
+
+
+def CosTheta(vec1, vec2):
+    """Return the cosine of the angle between two Lorentz vectors.
+    If four vectors are used, they must be of the form (tt, xx, yy, zz)."""
+    if( len(vec1) < 3 or
+        len(vec2) < 3 ):
+        raise RuntimeError('Vector length < 3.')
+
+    elif( len(vec1) != len(vec2) ):
+        raise RuntimeError('Vector lengths do not match.')
+
+    elif( len(vec1) == 3 ): #Vectors are of equal length already
+        dot = vec1[0]*vec2[0] + vec1[1]*vec2[1] + vec1[2]*vec2[2]
+        dot /= (_sqrt(vec1[0]**2 + vec1[1]**2 + vec1[2]**2) *
+                _sqrt(vec2[0]**2 + vec2[1]**2 + vec2[2]**2))
+        
+    elif( len(vec1) == 4 ):
+        dot = vec1[1]*vec2[1] + vec1[2]*vec2[2] + vec1[3]*vec2[3]
+        dot /= (_sqrt(vec1[1]**2 + vec1[2]**2 + vec1[3]**2) *
+                _sqrt(vec2[1]**2 + vec2[2]**2 + vec2[3]**2))
+        
+    else:
+        raise RuntimeError(
+            'Error calculating dot product. Check vector length')
+    
+    return dot
+
+
+#Array versions. Batches of four-vectors are VecFourArrays or (4, N) arrays
+#in the (px, py, pz, E) order of VecFourArray; three-vectors may be (3, N).
+
+def _numpy():
+    """Import NumPy on first use, so the scalar functions do not need it."""
+    try:
+        import numpy
+    except ImportError:
+        raise RuntimeError('The array observables require numpy.')
+    return numpy
+
+
+def _Columns(vec):
+    """Return the (4, N) or (3, N) float array behind a batch of vectors."""
+    if( hasattr(vec, 'Data') ):
+        return vec.Data()
+    return _numpy().asarray(vec, dtype=float)
+
+
+def _Stack(vecs):
+    """Return a sequence of batches as one (4, k, N) array."""
+    np = _numpy()
+    return np.stack([_Columns(v) for v in vecs], axis=1)
+
+
+def EtaArray(pz, p):
+    """Return the pseudorapidity of arrays of pz and p, with the edge cases
+    of VecThree.Eta: 0 for p = 0 and +-1e72 for pz = +-p."""
+    np = _numpy()
+    pz = np.asarray(pz, dtype=float)
+    p = np.asarray(p, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        eta = 0.5*np.log((p + pz) / (p - pz))
+    eta = np.where(p == pz, 1e72, eta)
+    eta = np.where(p == -pz, -1e72, eta)
+    return np.where(p == 0, 0.0, eta)
+
+
+def PhiArray(py, px):
+    """Return phi in [0, 2 pi) of arrays of py and px, as Phi does."""
+    np = _numpy()
+    phi = np.arctan2(py, px)
+    return np.where(phi < 0, phi + 2 * _pi, phi)
+
+
+def CosThetaArray(vec1, vec2):
+    """Return the cosine of the angle between the spatial parts of two
+    batches of vectors, 0 where either has p = 0."""
+    np = _numpy()
+    a = _Columns(vec1)[:3]
+    b = _Columns(vec2)[:3]
+    norm = np.sqrt((a*a).sum(axis=0) * (b*b).sum(axis=0))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dot = (a*b).sum(axis=0) / norm
+    return np.where(norm > 0, dot, 0.0)
+
+
+def Rapidity(vec):
+    """Return the rapidity 0.5 ln((E + pz)/(E - pz)) of a batch of four-
+    vectors, 0 for E = 0 and +-1e72 for E = +-pz."""
+    np = _numpy()
+    d = _Columns(vec)
+    pz, e = d[2], d[3]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        y = 0.5*np.log((e + pz) / (e - pz))
+    y = np.where(e == pz, 1e72, y)
+    y = np.where(e == -pz, -1e72, y)
+    return np.where(e == 0, 0.0, y)
+
+
+def InvariantMass(vec1, vec2):
+    """Return the invariant mass of the pairs in two batches of four-vectors,
+    0 where rounding makes the mass squared negative."""
+    np = _numpy()
+    s = _Columns(vec1) + _Columns(vec2)
+    m2 = s[3]**2 - s[0]**2 - s[1]**2 - s[2]**2
+    return np.sqrt(np.maximum(m2, 0.))
+
+
+def TransverseMass(vec1, vec2):
+    """Return the transverse mass of the pairs in two batches of four-
+    vectors, mT^2 = (ET1 + ET2)^2 - |pT1 + pT2|^2 with ET^2 = E^2 - pz^2."""
+    np = _numpy()
+    a = _Columns(vec1)
+    b = _Columns(vec2)
+    et1 = np.sqrt(np.maximum(a[3]**2 - a[2]**2, 0.))
+    et2 = np.sqrt(np.maximum(b[3]**2 - b[2]**2, 0.))
+    mt2 = (et1 + et2)**2 - (a[0] + b[0])**2 - (a[1] + b[1])**2
+    return np.sqrt(np.maximum(mt2, 0.))
+
+
+def DeltaPhiMatrix(vecs1, vecs2=None):
+    """Return delta phi in [-pi, pi) between every pair of the batches in
+    the sequences vecs1 and vecs2 (vecs1 itself if None), as an array of
+    shape (len(vecs1), len(vecs2), N)."""
+    np = _numpy()
+    a = _Stack(vecs1)
+    b = a if vecs2 is None else _Stack(vecs2)
+    phi1 = np.arctan2(a[1], a[0])
+    phi2 = np.arctan2(b[1], b[0])
+    dPhi = phi1[:, None] - phi2[None, :]
+    return (dPhi + _pi) % (2 * _pi) - _pi
+
+
+def DeltaRMatrix(vecs1, vecs2=None):
+    """Return delta R between every pair of the batches in the sequences
+    vecs1 and vecs2 (vecs1 itself if None), as an array of shape
+    (len(vecs1), len(vecs2), N)."""
+    np = _numpy()
+    a = _Stack(vecs1)
+    b = a if vecs2 is None else _Stack(vecs2)
+    eta1 = EtaArray(a[2], np.sqrt(a[0]**2 + a[1]**2 + a[2]**2))
+    eta2 = eta1 if vecs2 is None else EtaArray(
+        b[2], np.sqrt(b[0]**2 + b[1]**2 + b[2]**2))
+    dEta = eta1[:, None] - eta2[None, :]
+    return np.hypot(dEta, DeltaPhiMatrix(vecs1, vecs2))
+
+
+def HelicityAngle(daughter, parent):
+    """Return the cosine of the helicity angle: the angle between the
+    daughter's momentum in the parent's rest frame and the parent's flight
+    direction in the lab. The z axis is used for parents at rest."""
+    np = _numpy()
+    d = _Columns(daughter)
+    q = _Columns(parent)
+    p = np.sqrt(q[0]**2 + q[1]**2 + q[2]**2)
+    moving = p > 0
+    safe = np.where(moving, p, 1.)
+    nx = np.where(moving, q[0] / safe, 0.)
+    ny = np.where(moving, q[1] / safe, 0.)
+    nz = np.where(moving, q[2] / safe, 1.)
+    beta = p / q[3]
+    gamma = 1. / np.sqrt(1. - beta*beta)
+    #Only the component along the boost changes.
+    pl = d[0]*nx + d[1]*ny + d[2]*nz
+    pt2 = np.maximum(d[0]**2 + d[1]**2 + d[2]**2 - pl*pl, 0.)
+    plRest = gamma * (pl - beta * d[3])
+    norm = np.sqrt(pt2 + plRest*plRest)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cos = plRest / norm
+    return np.where(norm > 0, cos, 0.0)
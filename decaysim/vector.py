@@ -0,0 +1,591 @@
+from __future__ import division, print_function
+from math import sqrt as _sqrt, atan2 as _atan2, log as _log, pi as _pi
+
+#Force compatibility with python 2 and 3.
+try:
+    xrange
+except NameError:
+    xrange = range
+
+class VecThree(object):
+    """Simple three-vector implementation. Every method for retrieving or
+    setting a value is implemented for both momentum and position. The 
+    methods are interchangeable. P, Pt, Phi and Eta are computed on first
+    use and cached until a component is changed through any method."""
+    __slots__ = ('_x', '_y', '_z', '_p', '_pt', '_eta', '_phi')
+
+    def __init__(self, x=0, y=0, z=0):
+        self._x = x
+        self._y = y
+        self._z = z
+        self._p = self._pt = self._eta = self._phi = None
+        return
+
+    def P2(self):
+        """Return the squared magnitude of momentum."""
+        return self._x**2 + self._y**2 + self._z**2
+
+
+    def P(self):
+        """Return the magnitude of the momentum."""
+        p = self._p
+        if( p is None ):
+            p = self._p = _sqrt(self._x**2 + self._y**2 + self._z**2)
+        return p
+
+
+    def Pt(self):
+        """Return the transverse momentum of the particle."""
+        pt = self._pt
+        if( pt is None ):
+            pt = self._pt = _sqrt(self._x**2 + self._y**2)
+        return pt
+
+
+    def X(self):
+        """Return the x-component."""
+        return self._x
+
+
+    def Px(self):
+        """Return the px-component."""
+        return self._x
+
+
+    def Y(self):
+        return self._y
+    
+
+    def Py(self):
+        """Return the py-component."""
+        return self._y
+
+
+    def Z(self):
+        """Return the z-component."""
+        return self._z
+
+
+    def Pz(self):
+        """Return the pz-component."""
+        return self._z
+
+
+    def SetX(self, x):
+        """Set the x-component."""
+        self._x = x
+        self._p = self._pt = self._eta = self._phi = None
+
+
+    def SetPx(self, x):
+        """Set the x-component."""
+        self._x = x
+        self._p = self._pt = self._eta = self._phi = None
+
+
+    def SetY(self, y):
+        """Set the y-component."""
+        self._y = y
+        self._p = self._pt = self._eta = self._phi = None
+
+
+    def SetPy(self, y):
+        """Set the y-component."""
+        self._y = y
+        self._p = self._pt = self._eta = self._phi = None
+
+
+    def SetZ(self, z):
+        """Set the z-component."""
+        self._z = z
+        self._p = self._pt = self._eta = self._phi = None
+
+
+    def SetPz(self, z):
+        """Set the z-component."""
+        self._z = z
+        self._p = self._pt = self._eta = self._phi = None
+
+
+    def Phi(self):
+        """Return Phi of the particle."""
+        phi = self._phi
+        if( phi is None ):
+            phi = self._phi = _atan2(self._y, self._x)
+        return phi
+
+
+    def Eta(self):
+        """Return pseudorapidity of the particle."""
+        eta = self._eta
+        if( eta is not None ):
+            return eta
+        p = self.P()
+        if (p == 0):
+            eta = 0.0
+        elif (p == self._z and p > 0):
+            eta = 1e72
+        elif (p == -self._z):
+            eta = -1e72
+        else:
+            eta = 0.5*_log((p + self._z) / (p - self._z))
+        self._eta = eta
+        return eta
+
+
+    def DeltaPhi(self, v):
+        """Return delta phi of it and some other particle."""
+        dPhi = self.Phi() - v.Phi()
+        if (dPhi >= _pi):
+            dPhi -= 2 * _pi
+        if (dPhi < -_pi):
+            dPhi += 2 * _pi
+        return dPhi
+    
+    
+    def DeltaEta(self, v):
+        """Return delta eta of it and some other vector."""
+        return abs(self.Eta() - v.Eta())
+
+
+    def DeltaR(self, v):
+        """Return delta eta of it and some other vector."""
+        return _sqrt(self.DeltaEta(v)**2 + self.DeltaPhi(v)**2)
+
+
+    def Dot3(self, v):
+        """Return the dot product of it's and another vector's 
+        positions/momenta."""
+        return (self._x * v._x + self._y * v._y + self._z * v._z)
+
+
+    def Unit3(self):
+        """Return a unit three-vector."""
+        mag = self.P()
+        return VecThree(self._x / mag,
+                        self._y / mag,
+                        self._z / mag)
+
+
+    def CosTheta(self, v):
+        """Return the cosine of the angle between two vectors."""
+        return self.Dot3(v) / _sqrt(self.P2() * v.P2())
+
+
+    def Set(self, x, y, z):
+        """Set all spatial components at once."""
+        self._x = x
+        self._y = y
+        self._z = z
+        self._p = self._pt = self._eta = self._phi = None
+        return self
+
+
+    def Normalize(self):
+        """Scale the spatial components in place to unit length."""
+        mag = _sqrt(self._x**2 + self._y**2 + self._z**2)
+        self._x /= mag
+        self._y /= mag
+        self._z /= mag
+        self._p = self._pt = self._eta = self._phi = None
+        return self
+
+
+    def AddInto(self, v, out):
+        """Write the vector sum into out and return out."""
+        out._x = self._x + v._x
+        out._y = self._y + v._y
+        out._z = self._z + v._z
+        out._p = out._pt = out._eta = out._phi = None
+        return out
+
+
+    def SubInto(self, v, out):
+        """Write the vector difference into out and return out."""
+        out._x = self._x - v._x
+        out._y = self._y - v._y
+        out._z = self._z - v._z
+        out._p = out._pt = out._eta = out._phi = None
+        return out
+
+
+    def __add__(self, v):
+        """Return the vector sum."""
+        return VecThree(self._x + v._x, self._y + v._y, self._z + v._z)
+
+
+    def __sub__(self, v):
+        """Return the vector difference."""
+        return VecThree(self._x - v._x, self._y - v._y, self._z - v._z)
+
+
+    def __mul__(self, v):
+        """Multiply self by a scalar. This should not be used with a VecFour."""
+        return VecThree(self._x*v, self._y*v, self._z*v)
+
+
+    def __truediv__(self, v):
+        """Divide self by a scalar. This should mot be used with a VecFour."""
+        return VecThree(self._x/v, self._y/v, self._z/v)
+
+
+    def __eq__(self, v):
+        """Check equality of two vectors."""
+        if (self.X() == v.X() and
+            self.Y() == v.Y() and
+            self.Z() == v.Z()):
+            return True
+        return False
+
+
+    def __getitem__(self, key):
+        """Allows acces to values via indexing."""
+        if (key == 0 or key == 'x' or key == 'px'):
+            return self.X()
+        if (key == 1 or key == 'y' or key == 'py'):
+            return self.Y()
+        if (key == 2 or key == 'z' or key == 'pz'):
+            return self.Z()
+        else:
+            raise AttributeError
+
+
+    def __repr__(self):
+        return '(%.4f, %.4f, %.4f)' % (self.X(), self.Y(), self.Z())
+
+
+    def __str__(self):
+        """Represents vector as a string."""
+        return '(%.4f, %.4f, %.4f)' % (self.X(), self.Y(), self.Z())
+
+    
+    def __imul__(self, scalar):
+        """Return product of self and a scalar. This should not be used with
+        a VecFour."""
+        self._x *= scalar
+        self._y *= scalar
+        self._z *= scalar
+        self._p = self._pt = self._eta = self._phi = None
+        return self
+
+
+    def __iadd__(self, v):
+        """Adds another vector to self."""
+        self._x += v._x
+        self._y += v._y
+        self._z += v._z
+        self._p = self._pt = self._eta = self._phi = None
+        return self
+        
+
+    def __neg__(self):
+        """Flip sign of spcial/momentum components in place and return
+        self."""
+        self._x = -self._x
+        self._y = -self._y
+        self._z = -self._z
+        self._p = self._pt = self._eta = self._phi = None
+        return self
+
+
+    def Generator(self):
+        for i in xrange(3):
+            yield self[i]
+        
+class VecFour(VecThree):
+    """Simple four-vector implementation. Every method for retrieving or
+    setting a value is implemented for both momentum and position. The 
+    methods are interchangeable."""
+    __slots__ = ('_t',)
+
+    def __init__(self, x=0, y=0, z=0, t=0):
+        super(VecFour, self).__init__(x, y, z)
+        self._t = t
+        return
+
+
+    def T(self):
+        """Return the t-component."""
+        return self._t
+
+
+    def E(self):
+        """Return the e-component."""
+        return self._t
+
+
+    def M2(self):
+        """Return E^2 - P^2."""
+        return self._t**2 - (self._x**2 + self._y**2 + self._z**2)
+    
+
+    def SetT(self, t):
+        """Set the t-component."""
+        self._t = t
+        self._p = self._pt = self._eta = self._phi = None
+
+
+    def SetE(self, e):
+        """Set the e-component."""
+        self._t = e
+        self._p = self._pt = self._eta = self._phi = None
+
+
+    def Dot4(self, v):
+        """Return E1*E2 - P1*P2."""
+        return self._t * v._t - (self._x * v._x + self._y * v._y +
+                                 self._z * v._z)
+
+
+    def Unit4(self):
+        """Return a unit four-vector."""
+        mag = _sqrt(self._x**2 + self._y**2 + self._z**2 + self._t**2)
+        return VecFour(self._x / mag,
+                       self._y / mag,
+                       self._z / mag,
+                       self._t / mag)
+
+    
+    def BoostVector(self):
+        """Return a three-vector conaining Beta-x, Beta-y, and Beta-z."""
+        bx = self._x / self._t
+        by = self._y / self._t
+        bz = self._z / self._t
+        return VecThree(bx, by, bz)
+
+
+    def BoostVectorInto(self, out):
+        """Write Beta-x, Beta-y, and Beta-z into the three-vector out and
+        return out."""
+        out._x = self._x / self._t
+        out._y = self._y / self._t
+        out._z = self._z / self._t
+        out._p = out._pt = out._eta = out._phi = None
+        return out
+
+
+    def Boost(self, v):
+        """Boost the vector to the rest-frame of some other vector. It accepts
+        a VecThree of the components of beta."""
+        self.BoostInto(v, self)
+        return
+
+
+    def BoostInto(self, v, out):
+        """Write the vector boosted by the beta three-vector v into the
+        four-vector out and return out. out may be self."""
+        bx = v._x
+        by = v._y
+        bz = v._z
+        b2 = bx**2 + by**2 + bz**2
+        g = 1. / _sqrt(1. - b2)
+        t = self._t
+        bp = self._x * bx + self._y * by + self._z * bz
+
+        if (b2 > 0):
+            g2 = (g - 1.)/b2
+        else:
+            g2 = 0.
+
+        k = g2*bp + g*t
+        out._x = self._x + k*bx
+        out._y = self._y + k*by
+        out._z = self._z + k*bz
+        out._t = g*(t + bp)
+        out._p = out._pt = out._eta = out._phi = None
+        return out
+
+
+    def Set(self, x, y, z, t):
+        """Set all four components at once."""
+        self._x = x
+        self._y = y
+        self._z = z
+        self._t = t
+        self._p = self._pt = self._eta = self._phi = None
+        return self
+
+
+    def AddInto(self, v, out):
+        """Write the four-vector sum into out and return out."""
+        out._x = self._x + v._x
+        out._y = self._y + v._y
+        out._z = self._z + v._z
+        out._t = self._t + v._t
+        out._p = out._pt = out._eta = out._phi = None
+        return out
+
+
+    def __add__(self, v):
+        """Return the vector sum."""
+        return VecFour(self._x + v._x, self._y + v._y,
+                       self._z + v._z, self._t + v._t)
+
+
+    def __sub__(self, v):
+        """Return the difference of the vectors' components."""
+        return VecThree(self._x - v._x, self._y - v._y, self._z - v._z)
+
+
+    def __eq__(self, v):
+        """Check equality of two vectors."""
+        if (self.X() == v.X() and
+            self.Y() == v.Y() and
+            self.Z() == v.Z() and
+            self.T() == v.T()):
+            return True
+        return False
+
+
+    def __getitem__(self, key):
+        if (key == 0 or key == 'x' or key == 'px'):
+            return self.X()
+        if (key == 1 or key == 'y' or key == 'py'):
+            return self.Y()
+        if (key == 2 or key == 'z' or key == 'pz'):
+            return self.Z()
+        if (key == 3 or key == 't' or key == 'e'):
+            return self.T()
+        else:
+            raise AttributeError
+
+        
+    def __repr__(self):
+        return '(%.4f, %.4f, %.4f, %.4f)' % (self.X(), self.Y(),
+                                             self.Z(), self.T())
+
+
+    def __str__(self):
+        """Represents vector as a string."""
+        return '(%.4f, %.4f, %.4f, %.4f)' % (self.X(), self.Y(),
+                                       self.Z(), self.T())
+
+
+    def __iadd__(self, v):
+        """Adds another vector to self."""
+        self._x += v._x
+        self._y += v._y
+        self._z += v._z
+        self._t += v._t
+        self._p = self._pt = self._eta = self._phi = None
+        return self
+
+
+    def Generator(self):
+        for i in xrange(4):
+            yield self[i]
+
+
+class LorentzBoost(object):
+    """Lorentz transformation acting on (x, y, z, t). Built from a beta
+    three-vector it is the boost VecFour.Boost applies, with gamma and
+    (gamma-1)/beta^2 computed once so it can be applied to many vectors.
+    Compositions are general transformations kept as a 4x4 matrix. Boosts
+    compose by multiplication and invert without recomputation."""
+    __slots__ = ('_b', '_g', '_g2', '_m')
+
+    def __init__(self, beta=None, matrix=None):
+        if( matrix is not None ):
+            self._b = None
+            self._m = tuple(tuple(row) for row in matrix)
+            return
+        if( beta is None ):
+            self._Init(0., 0., 0.)
+        else:
+            self._Init(beta._x, beta._y, beta._z)
+        return
+
+
+    def _Init(self, bx, by, bz):
+        b2 = bx**2 + by**2 + bz**2
+        g = 1. / _sqrt(1. - b2)
+        if (b2 > 0):
+            g2 = (g - 1.)/b2
+        else:
+            g2 = 0.
+        self._b = (bx, by, bz)
+        self._g = g
+        self._g2 = g2
+        self._m = None
+        return
+
+
+    @classmethod
+    def FromVector(cls, vec):
+        """Return the boost from the rest frame of the four-vector vec."""
+        boost = cls.__new__(cls)
+        boost._Init(vec._x / vec._t, vec._y / vec._t, vec._z / vec._t)
+        return boost
+
+
+    def Matrix(self):
+        """Return the matrix as a tuple of rows."""
+        if( self._m is None ):
+            bx, by, bz = self._b
+            g = self._g
+            g2 = self._g2
+            self._m = ((1. + g2*bx*bx, g2*bx*by, g2*bx*bz, g*bx),
+                       (g2*by*bx, 1. + g2*by*by, g2*by*bz, g*by),
+                       (g2*bz*bx, g2*bz*by, 1. + g2*bz*bz, g*bz),
+                       (g*bx, g*by, g*bz, g))
+        return self._m
+
+
+    def Apply(self, vec):
+        """Transform the four-vector vec in place."""
+        return self.ApplyInto(vec, vec)
+
+
+    def ApplyInto(self, vec, out):
+        """Write the transformed vec into out and return out. out may be
+        vec."""
+        x = vec._x
+        y = vec._y
+        z = vec._z
+        t = vec._t
+        if( self._b is not None ):
+            bx, by, bz = self._b
+            bp = x*bx + y*by + z*bz
+            k = self._g2*bp + self._g*t
+            out._x = x + k*bx
+            out._y = y + k*by
+            out._z = z + k*bz
+            out._t = self._g*(t + bp)
+            out._p = out._pt = out._eta = out._phi = None
+            return out
+        m0, m1, m2, m3 = self._m
+        out._x = m0[0]*x + m0[1]*y + m0[2]*z + m0[3]*t
+        out._y = m1[0]*x + m1[1]*y + m1[2]*z + m1[3]*t
+        out._z = m2[0]*x + m2[1]*y + m2[2]*z + m2[3]*t
+        out._t = m3[0]*x + m3[1]*y + m3[2]*z + m3[3]*t
+        out._p = out._pt = out._eta = out._phi = None
+        return out
+
+
+    def Inverse(self):
+        """Return the inverse transformation: the boost by -beta, or
+        eta M^T eta for a general transformation."""
+        if( self._b is not None ):
+            inv = LorentzBoost.__new__(LorentzBoost)
+            inv._b = (-self._b[0], -self._b[1], -self._b[2])
+            inv._g = self._g
+            inv._g2 = self._g2
+            inv._m = None
+            return inv
+        s = (-1., -1., -1., 1.)
+        m = self._m
+        return LorentzBoost(matrix=[[s[i]*s[j]*m[j][i] for j in xrange(4)]
+                                    for i in xrange(4)])
+
+
+    def Compose(self, other):
+        """Return the transformation applying other first, then self."""
+        a = self.Matrix()
+        b = other.Matrix()
+        return LorentzBoost(matrix=[[sum(a[i][k]*b[k][j] for k in xrange(4))
+                                     for j in xrange(4)] for i in xrange(4)])
+
+
+    def __mul__(self, other):
+        """Same as Compose."""
+        return self.Compose(other)
@@ -0,0 +1,458 @@
+from __future__ import division, print_function
+import numpy as _np
+from .vector import VecThree, VecFour, LorentzBoost
+
+
+class VecThreeArray(object):
+    """Batch of three-vectors stored as contiguous float64 columns. The
+    methods mirror VecThree but act on every vector of the batch at once."""
+    _ncomp = 3
+    _keys = {0: 0, 'x': 0, 'px': 0,
+             1: 1, 'y': 1, 'py': 1,
+             2: 2, 'z': 2, 'pz': 2}
+
+    def __init__(self, x=0, y=0, z=0, data=None):
+        if( data is None ):
+            x, y, z = _np.broadcast_arrays(*[_np.asarray(c, dtype=_np.float64)
+                                             for c in (x, y, z)])
+            data = _np.empty((self._ncomp, x.size), dtype=_np.float64)
+            data[0] = x.ravel()
+            data[1] = y.ravel()
+            data[2] = z.ravel()
+        self._data = data
+        return
+
+
+    @classmethod
+    def Zeros(cls, n):
+        """Return a batch of n zero vectors."""
+        return cls(data=_np.zeros((cls._ncomp, n), dtype=_np.float64))
+
+
+    @classmethod
+    def Empty(cls, n):
+        """Return a batch of n uninitialized vectors, for use as a buffer."""
+        return cls(data=_np.empty((cls._ncomp, n), dtype=_np.float64))
+
+
+    @classmethod
+    def FromVectors(cls, vecs):
+        """Build a batch from a sequence of scalar vectors. A VecThreeArray
+        keeps the spatial components of VecFours."""
+        data = _np.array([list(v.Generator())[:cls._ncomp] for v in vecs],
+                         dtype=_np.float64).reshape(-1, cls._ncomp)
+        return cls(data=_np.ascontiguousarray(data.T))
+
+
+    def Data(self):
+        """Return the underlying (components, N) array."""
+        return self._data
+
+
+    def P2(self):
+        """Return the squared magnitude of momentum."""
+        d = self._data
+        return d[0]**2 + d[1]**2 + d[2]**2
+
+
+    def P(self):
+        """Return the magnitude of the momentum."""
+        return _np.sqrt(self.P2())
+
+
+    def Pt(self):
+        """Return the transverse momentum."""
+        return _np.hypot(self._data[0], self._data[1])
+
+
+    def X(self):
+        """Return the x-component."""
+        return self._data[0]
+
+
+    def Px(self):
+        """Return the px-component."""
+        return self._data[0]
+
+
+    def Y(self):
+        """Return the y-component."""
+        return self._data[1]
+
+
+    def Py(self):
+        """Return the py-component."""
+        return self._data[1]
+
+
+    def Z(self):
+        """Return the z-component."""
+        return self._data[2]
+
+
+    def Pz(self):
+        """Return the pz-component."""
+        return self._data[2]
+
+
+    def SetX(self, x):
+        """Set the x-component."""
+        self._data[0] = x
+
+
+    def SetPx(self, x):
+        """Set the x-component."""
+        self._data[0] = x
+
+
+    def SetY(self, y):
+        """Set the y-component."""
+        self._data[1] = y
+
+
+    def SetPy(self, y):
+        """Set the y-component."""
+        self._data[1] = y
+
+
+    def SetZ(self, z):
+        """Set the z-component."""
+        self._data[2] = z
+
+
+    def SetPz(self, z):
+        """Set the z-component."""
+        self._data[2] = z
+
+
+    def Phi(self):
+        """Return phi of every vector."""
+        return _np.arctan2(self._data[1], self._data[0])
+
+
+    def Eta(self):
+        """Return pseudorapidity of every vector, with the same edge cases
+        as VecThree.Eta."""
+        z = self._data[2]
+        p = self.P()
+        with _np.errstate(divide='ignore', invalid='ignore'):
+            eta = 0.5*_np.log((p + z) / (p - z))
+        eta[p == z] = 1e72
+        eta[p == -z] = -1e72
+        eta[p == 0] = 0.0
+        return eta
+
+
+    def DeltaPhi(self, v):
+        """Return delta phi in [-pi, pi)."""
+        dPhi = self.Phi() - v.Phi()
+        return (dPhi + _np.pi) % (2 * _np.pi) - _np.pi
+
+
+    def DeltaEta(self, v):
+        """Return delta eta."""
+        return _np.abs(self.Eta() - v.Eta())
+
+
+    def DeltaR(self, v):
+        """Return delta R."""
+        return _np.hypot(self.DeltaEta(v), self.DeltaPhi(v))
+
+
+    def Dot3(self, v):
+        """Return the dot product of the spatial components."""
+        a = self._data
+        b = v._data
+        return a[0]*b[0] + a[1]*b[1] + a[2]*b[2]
+
+
+    def Unit3(self):
+        """Return a batch of unit three-vectors."""
+        return VecThreeArray(data=self._data[:3] / self.P())
+
+
+    def CosTheta(self, v):
+        """Return the cosine of the angle between two vectors."""
+        return self.Dot3(v) / (self.P() * v.P())
+
+
+    def __len__(self):
+        return self._data.shape[1]
+
+
+    def __add__(self, v):
+        """Return the vector sum."""
+        return VecThreeArray(data=self._data[:3] + v._data[:3])
+
+
+    def __sub__(self, v):
+        """Return the vector difference."""
+        return VecThreeArray(data=self._data[:3] - v._data[:3])
+
+
+    def __mul__(self, v):
+        """Multiply by a scalar or an array of per-vector scalars."""
+        return VecThreeArray(data=self._data[:3] * v)
+
+
+    def __truediv__(self, v):
+        """Divide by a scalar or an array of per-vector scalars."""
+        return VecThreeArray(data=self._data[:3] / v)
+
+
+    def __getitem__(self, key):
+        """Return a component column by name or index, or a sub-batch for
+        a slice, mask or index array. Single entries are returned by
+        Vector(i)."""
+        try:
+            return self._data[self._keys[key]]
+        except (KeyError, TypeError):
+            pass
+        if( isinstance(key, (int, _np.integer)) ):
+            raise RuntimeError('Index %d is not a component; use Vector(%d) '
+                               'for a single entry.' % (key, key))
+        return self.__class__(data=_np.ascontiguousarray(self._data[:, key]))
+
+
+    def Vector(self, i):
+        """Return the i-th entry as a scalar vector."""
+        return VecThree(*[float(c) for c in self._data[:, i]])
+
+
+    def __repr__(self):
+        return '%s(n=%d)' % (self.__class__.__name__, len(self))
+
+
+class VecFourArray(VecThreeArray):
+    """Batch of four-vectors stored as contiguous float64 columns in the
+    order (px, py, pz, E). The methods mirror VecFour."""
+    _ncomp = 4
+    _keys = dict(VecThreeArray._keys)
+    _keys.update({3: 3, 't': 3, 'e': 3})
+
+    def __init__(self, x=0, y=0, z=0, t=0, data=None):
+        if( data is None ):
+            x, y, z, t = _np.broadcast_arrays(
+                *[_np.asarray(c, dtype=_np.float64) for c in (x, y, z, t)])
+            data = _np.empty((4, x.size), dtype=_np.float64)
+            data[0] = x.ravel()
+            data[1] = y.ravel()
+            data[2] = z.ravel()
+            data[3] = t.ravel()
+        self._data = data
+        return
+
+
+    def T(self):
+        """Return the t-component."""
+        return self._data[3]
+
+
+    def E(self):
+        """Return the e-component."""
+        return self._data[3]
+
+
+    def SetT(self, t):
+        """Set the t-component."""
+        self._data[3] = t
+
+
+    def SetE(self, e):
+        """Set the e-component."""
+        self._data[3] = e
+
+
+    def M2(self):
+        """Return E^2 - P^2."""
+        return self._data[3]**2 - self.P2()
+
+
+    def M(self):
+        """Return the invariant mass, negative for spacelike vectors."""
+        m2 = self.M2()
+        return _np.sign(m2) * _np.sqrt(_np.abs(m2))
+
+
+    def Dot4(self, v):
+        """Return E1*E2 - P1*P2."""
+        return self._data[3] * v._data[3] - self.Dot3(v)
+
+
+    def Unit4(self):
+        """Return a batch of unit four-vectors."""
+        mag = _np.sqrt((self._data**2).sum(axis=0))
+        return VecFourArray(data=self._data / mag)
+
+
+    def BoostVector(self):
+        """Return a VecThreeArray containing Beta-x, Beta-y, and Beta-z."""
+        return VecThreeArray(data=self._data[:3] / self._data[3])
+
+
+    def Boost(self, v):
+        """Boost every vector in place by the matching beta in v, a
+        VecThreeArray (or VecThree to boost the whole batch alike)."""
+        if( isinstance(v, VecThree) ):
+            b = _np.array([v.X(), v.Y(), v.Z()], dtype=_np.float64)[:, None]
+        else:
+            b = v._data[:3]
+        d = self._data
+        b2 = b[0]**2 + b[1]**2 + b[2]**2
+        g = 1. / _np.sqrt(1. - b2)
+        bp = b[0]*d[0] + b[1]*d[1] + b[2]*d[2]
+        with _np.errstate(divide='ignore', invalid='ignore'):
+            g2 = _np.where(b2 > 0, (g - 1.) / b2, 0.)
+        k = g2*bp + g*d[3]
+        d[0] += k*b[0]
+        d[1] += k*b[1]
+        d[2] += k*b[2]
+        d[3] = g*(d[3] + bp)
+        return
+
+
+    def __add__(self, v):
+        """Return the vector sum."""
+        return VecFourArray(data=self._data + v._data)
+
+
+    def __sub__(self, v):
+        """Return the difference of the spatial components, as
+        VecFour.__sub__ does."""
+        return VecThreeArray(data=self._data[:3] - v._data[:3])
+
+
+    def __iadd__(self, v):
+        """Add another batch to self in place."""
+        self._data += v._data
+        return self
+
+
+    def Vector(self, i):
+        """Return the i-th entry as a VecFour."""
+        return VecFour(*[float(c) for c in self._data[:, i]])
+
+
+_metric = _np.array([-1., -1., -1., 1.])
+
+
+class LorentzBoostArray(object):
+    """Stack of Lorentz transformations, one per event, or a single one
+    shared by the whole batch. Pure boosts built from betas keep only beta,
+    gamma and (gamma-1)/beta^2, computed once and applied to any number of
+    batches; general transformations (e.g. compositions) are stored as a
+    (4, 4, N) or (4, 4) matrix in (x, y, z, t) order and applied with one
+    product. Built from betas it matches VecFourArray.Boost."""
+
+
+    def __init__(self, matrices):
+        if( isinstance(matrices, LorentzBoost) ):
+            matrices = matrices.Matrix()
+        self._m = _np.asarray(matrices, dtype=_np.float64)
+        self._beta = None
+        return
+
+
+    @classmethod
+    def FromBeta(cls, beta):
+        """Return the boosts for a VecThreeArray of betas."""
+        self = cls.__new__(cls)
+        b = beta.Data()[:3]
+        b2 = b[0]**2 + b[1]**2 + b[2]**2
+        self._beta = b
+        self._g = 1. / _np.sqrt(1. - b2)
+        with _np.errstate(divide='ignore', invalid='ignore'):
+            self._g2 = _np.where(b2 > 0, (self._g - 1.) / b2, 0.)
+        self._m = None
+        return self
+
+
+    @classmethod
+    def FromVectors(cls, vecs):
+        """Return the boosts from the rest frames of a VecFourArray."""
+        return cls.FromBeta(vecs.BoostVector())
+
+
+    def Matrices(self):
+        """Return the transformations as a (4, 4, N) or (4, 4) array."""
+        if( self._m is None ):
+            b = self._beta
+            g = self._g
+            m = _np.empty((4, 4, b.shape[1]))
+            g2b = self._g2 * b
+            for i in range(3):
+                for j in range(3):
+                    _np.multiply(g2b[i], b[j], out=m[i, j])
+                m[i, i] += 1.
+            _np.multiply(g, b, out=m[:3, 3])
+            m[3, :3] = m[:3, 3]
+            m[3, 3] = g
+            self._m = m
+        return self._m
+
+
+    def __len__(self):
+        if( self._beta is not None ):
+            return self._beta.shape[1]
+        return self._m.shape[2] if self._m.ndim == 3 else 1
+
+
+    def Apply(self, vecs):
+        """Transform a VecFourArray in place."""
+        d = vecs.Data()
+        if( self._beta is not None ):
+            b = self._beta
+            bp = b[0]*d[0] + b[1]*d[1] + b[2]*d[2]
+            k = self._g2*bp + self._g*d[3]
+            d[0] += k*b[0]
+            d[1] += k*b[1]
+            d[2] += k*b[2]
+            d[3] = self._g*(d[3] + bp)
+        elif( self._m.ndim == 2 ):
+            d[...] = self._m.dot(d)
+        else:
+            d[...] = _np.einsum('ijn,jn->in', self._m, d)
+        return vecs
+
+
+    def ApplyInto(self, vecs, out):
+        """Write the transformed batch into the VecFourArray out and return
+        out."""
+        if( out is not vecs ):
+            out.Data()[...] = vecs.Data()
+        return self.Apply(out)
+
+
+    def Inverse(self):
+        """Return the inverse transformations: the boosts by -beta, or
+        eta M^T eta for general transformations."""
+        if( self._beta is not None ):
+            inv = LorentzBoostArray.__new__(LorentzBoostArray)
+            inv._beta = -self._beta
+            inv._g = self._g
+            inv._g2 = self._g2
+            inv._m = None
+            return inv
+        m = _np.swapaxes(self._m, 0, 1)
+        if( m.ndim == 3 ):
+            return LorentzBoostArray(m * _metric[:, None, None] *
+                                     _metric[None, :, None])
+        return LorentzBoostArray(m * _metric[:, None] * _metric[None, :])
+
+
+    def Compose(self, other):
+        """Return the transformations applying other first, then self."""
+        a = self.Matrices()
+        b = other.Matrices()
+        if( a.ndim == 2 and b.ndim == 2 ):
+            return LorentzBoostArray(a.dot(b))
+        if( a.ndim == 2 ):
+            return LorentzBoostArray(_np.einsum('ik,kjn->ijn', a, b))
+        if( b.ndim == 2 ):
+            return LorentzBoostArray(_np.einsum('ikn,kj->ijn', a, b))
+        return LorentzBoostArray(_np.einsum('ikn,kjn->ijn', a, b))
+
+
+    def __mul__(self, other):
+        """Same as Compose."""
+        return self.Compose(other)